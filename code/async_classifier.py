@@ -0,0 +1,274 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from prediction_server import LatencyTracker
+from predictor import DEFAULT_ENCODER_PATH, DEFAULT_MODEL_PATH, Predictor
+
+# -----------------------------------------
+# 🌊 Asyncio streaming classifier for sockets, pipes and tailed files
+# -----------------------------------------
+# Readers (TCP connections, stdin, a followed file) put one payload per line
+# on a bounded queue; when it is full they stop reading, so a fast producer
+# is slowed down by TCP flow control or a full pipe instead of growing
+# memory. One batching task drains the queue into batches of up to
+# --max-batch lines (waiting at most --max-wait-ms after the first) and
+# hands each batch to a worker process. At most two batches per worker are
+# in flight. The event loop itself never extracts features, and records are
+# emitted (JSON lines) as their batch completes.
+
+DEFAULT_QUEUE_SIZE = 8192
+MAX_LINE_BYTES = 1 << 20  # also bounds what a reader buffers before pausing its transport
+_STOP = object()
+_PREDICTOR = None
+
+def _load_predictor(model_path, encoder_path):
+    global _PREDICTOR
+    _PREDICTOR = Predictor.load(model_path, encoder_path)
+
+def _predict(texts):
+    labels, proba = _PREDICTOR.predict_proba(texts)
+    return labels, proba.max(axis=1)
+
+class StreamClassifier:
+    """Classify lines fed from any number of asyncio readers.
+
+    ``emit(record)`` is called on the event loop for every classified line,
+    with ``seq`` (arrival order), ``text``, ``label``, ``confidence`` and
+    ``latency_ms`` (arrival to result). ``workers=0`` predicts in a thread
+    of this process instead of worker processes.
+    """
+
+    def __init__(self, model_path=DEFAULT_MODEL_PATH, encoder_path=DEFAULT_ENCODER_PATH, emit=None, workers=1,
+                 max_batch_size=256, max_wait_ms=5.0, queue_size=DEFAULT_QUEUE_SIZE):
+        self.model_path = model_path
+        self.encoder_path = encoder_path
+        self.emit = emit or (lambda record: None)
+        self.workers = workers
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue_size = queue_size
+        self._seq = 0
+        self._pending = 0  # queued or being classified
+        self.reset_stats()
+
+    async def start(self):
+        if self.workers:
+            self._executor = ProcessPoolExecutor(self.workers, initializer=_load_predictor,
+                                                 initargs=(self.model_path, self.encoder_path))
+        else:
+            _load_predictor(self.model_path, self.encoder_path)
+            self._executor = ThreadPoolExecutor(1)
+        self._queue = asyncio.Queue(self.queue_size)
+        self._slots = asyncio.Semaphore(2 * max(self.workers, 1))
+        self._in_flight = set()
+        # Load the model everywhere before the first line arrives
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _predict, ["warm up"])
+                               for _ in range(max(self.workers, 1))))
+        self.reset_stats()
+        self._batcher = asyncio.create_task(self._run())
+        return self
+
+    def reset_stats(self):
+        """Start a new measurement window (latencies, throughput, errors)."""
+        self.latency = LatencyTracker(window=1_000_000)
+        self.errors = 0
+        self.first_arrival = self.last_result = None
+
+    async def put(self, text):
+        """Queue one payload; waits while the queue is full (backpressure)."""
+        arrival = time.perf_counter()
+        if self.first_arrival is None:
+            self.first_arrival = arrival
+        self._pending += 1
+        await self._queue.put((self._seq, text, arrival))
+        self._seq += 1
+
+    async def feed(self, reader):
+        """Queue every non-empty line of an ``asyncio.StreamReader`` until EOF.
+
+        A line longer than the reader's limit (MAX_LINE_BYTES) counts as one
+        error and is discarded up to its newline.
+        """
+        skipping = False
+        while True:
+            try:
+                line = await reader.readuntil(b"\n")
+            except asyncio.LimitOverrunError as e:
+                await reader.readexactly(e.consumed)  # drop what is buffered, keep looking for the newline
+                if not skipping:
+                    self.errors += 1
+                    skipping = True
+                continue
+            except asyncio.IncompleteReadError as e:
+                line = e.partial  # EOF; a last line without a newline
+                if not line or skipping:
+                    break
+            if skipping:
+                skipping = False  # this is the oversized line's tail
+                continue
+            text = line.decode("utf-8", errors="replace").rstrip("\r\n")
+            if text:
+                await self.put(text)
+
+    async def close(self):
+        """Classify everything queued, then stop the workers."""
+        await self._queue.put(_STOP)
+        await self._batcher
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight)
+        self._executor.shutdown()
+
+    async def drain(self):
+        """Wait until everything queued so far has been emitted."""
+        while self._pending:
+            await asyncio.sleep(0.005)
+
+    # -- batching ----------------------------------------------------------
+
+    async def _next_batch(self):
+        item = await self._queue.get()
+        if item is _STOP:
+            return None, True
+        batch = [item]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _run(self):
+        stop = False
+        while not stop:
+            batch, stop = await self._next_batch()
+            if batch:
+                await self._slots.acquire()
+                task = asyncio.create_task(self._classify(batch))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+
+    async def _classify(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            labels, confidence = await loop.run_in_executor(self._executor, _predict, [text for _, text, _ in batch])
+        except Exception as e:
+            self.errors += len(batch)
+            print(f"batch of {len(batch)} failed: {e}", file=sys.stderr)
+            return
+        finally:
+            self._slots.release()
+            self._pending -= len(batch)
+        done = time.perf_counter()
+        self.last_result = done
+        for (seq, text, arrival), label, p in zip(batch, labels, confidence):
+            self.latency.record(done - arrival)
+            self.emit({"seq": seq, "text": text, "label": label, "confidence": round(float(p), 4),
+                       "latency_ms": round((done - arrival) * 1000, 3)})
+
+    def stats(self):
+        stats = self.latency.summary()
+        if self.first_arrival is not None and self.last_result is not None:
+            elapsed = self.last_result - self.first_arrival
+            stats["seconds"] = round(elapsed, 3)
+            stats["rows_per_s"] = round(stats["requests"] / elapsed, 1) if elapsed > 0 else None
+        stats["errors"] = self.errors
+        return stats
+
+# -----------------------------------------
+# 📥 Sources
+# -----------------------------------------
+
+async def feed_stdin(classifier):
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=MAX_LINE_BYTES)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    await classifier.feed(reader)
+
+async def serve_tcp(classifier, host, port):
+    """Accept connections on host:port; each sends one payload per line."""
+    async def handle(reader, writer):
+        try:
+            await classifier.feed(reader)
+        finally:
+            writer.close()
+    return await asyncio.start_server(handle, host, port, limit=MAX_LINE_BYTES)
+
+async def follow_file(classifier, path, follow=True, poll_seconds=0.2):
+    """Queue the lines of ``path``; with ``follow``, keep reading as it grows (tail -f)."""
+    with open(path, encoding="utf-8", errors="replace", newline="") as f:
+        partial = ""
+        while True:
+            line = f.readline()
+            if not line:
+                if not follow:
+                    break
+                await asyncio.sleep(poll_seconds)
+                continue
+            if not line.endswith("\n"):
+                partial += line  # the writer is mid-line
+                continue
+            text = (partial + line).rstrip("\r\n")
+            partial = ""
+            if text:
+                await classifier.put(text)
+        if partial.strip():
+            await classifier.put(partial.rstrip("\r\n"))
+
+async def run(args):
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    emit = lambda record: out.write(json.dumps(record) + "\n")
+    classifier = await StreamClassifier(args.model, args.encoder, emit, args.workers, args.max_batch,
+                                        args.max_wait_ms, args.queue_size).start()
+    try:
+        if args.source == "-":
+            await feed_stdin(classifier)
+        elif args.source.startswith("tcp://"):
+            host, _, port = args.source[len("tcp://"):].rpartition(":")
+            server = await serve_tcp(classifier, host or "127.0.0.1", int(port))
+            print(f"Listening on {args.source}", file=sys.stderr)
+            async with server:
+                await server.serve_forever()
+        else:
+            await follow_file(classifier, args.source, args.follow)
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await classifier.close()
+        out.flush()
+        print(json.dumps(classifier.stats()), file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify a stream of payloads, one per line")
+    parser.add_argument("source", help="'-' (stdin), tcp://HOST:PORT (listen), or a file path")
+    parser.add_argument("--follow", action="store_true", help="keep reading the file as it grows")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--encoder", default=DEFAULT_ENCODER_PATH)
+    parser.add_argument("-o", "--output", help="JSON-lines output (default: stdout)")
+    parser.add_argument("--workers", type=int, default=1, help="prediction processes (0 = a thread in this process)")
+    parser.add_argument("--max-batch", type=int, default=256, help="largest batch")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="longest wait to fill a batch")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="lines buffered before readers are paused")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
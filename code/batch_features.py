@@ -0,0 +1,296 @@
+import string
+from functools import cached_property
+
+import numpy as np
+
+from digraph_tables import default_tables, digraph_pairs, digraph_mean
+from feature_extraction import CHAR_POOL, rel_freq, english_freq_list, extract_features
+from feature_schema import FEATURE_COLUMNS, groups_for, normalize_text
+from ngrams import ngram_features_batch
+from periodic import periodic_features_batch
+
+# -----------------------------------------
+# 🧩 Byte lookup tables (same rules as str.isdigit / isalpha / isalnum)
+# -----------------------------------------
+
+BYTE_VALUES = np.arange(256, dtype=np.float64)
+IS_DIGIT = np.array([chr(i).isdigit() for i in range(256)], dtype=np.float64)
+IS_ALPHA = np.array([chr(i).isalpha() for i in range(256)], dtype=np.float64)
+NOT_ALNUM = np.array([not chr(i).isalnum() for i in range(256)], dtype=np.float64)
+
+UPPER_CODES = np.arange(ord('A'), ord('Z') + 1)
+LOWER_CODES = np.arange(ord('a'), ord('z') + 1)
+REL_FREQ = np.array([rel_freq[chr(c)] for c in UPPER_CODES])
+
+DEFAULT_BATCH_SIZE = 4096
+MAX_CHUNK_CHARS = 1 << 22  # rows x longest row per chunk; bounds memory when texts are long
+
+# -----------------------------------------
+# 🔢 Encoding
+# -----------------------------------------
+
+def encode_batch(texts):
+    """Pack texts into a zero-padded uint8 matrix plus a lengths array.
+
+    Rows that contain characters outside latin-1 cannot be stored as bytes;
+    they are left empty and their indices are returned in ``fallback``.
+    """
+    encoded = []
+    fallback = []
+    for i, text in enumerate(texts):
+        try:
+            encoded.append(text.encode('latin-1'))
+        except UnicodeEncodeError:
+            encoded.append(b'')
+            fallback.append(i)
+
+    lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+    width = int(lengths.max()) if len(lengths) else 0
+    matrix = np.zeros((len(encoded), width), dtype=np.uint8)
+    matrix[np.arange(width) < lengths[:, None]] = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return matrix, lengths, fallback
+
+def _byte_keys(matrix, lengths):
+    # row * 256 + byte for every real (non-padding) position, in text order
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    return rows * 256 + matrix[np.arange(matrix.shape[1]) < lengths[:, None]]
+
+def byte_histograms(matrix, lengths):
+    """Per-row 256-bin byte counts, ignoring the padding."""
+    n = len(lengths)
+    counts = np.bincount(_byte_keys(matrix, lengths), minlength=n * 256)
+    return counts.reshape(n, 256)
+
+def first_positions(matrix, lengths):
+    """Per-row index of the first occurrence of every byte (-1 if absent)."""
+    n = len(lengths)
+    keys = _byte_keys(matrix, lengths)
+    uniq, first = np.unique(keys, return_index=True)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    positions = np.full(n * 256, -1, dtype=np.int64)
+    positions[uniq] = first - starts[uniq // 256]
+    return positions.reshape(n, 256)
+
+# -----------------------------------------
+# 📊 Histogram-based features
+# -----------------------------------------
+
+def _safe_divide(num, den):
+    return np.divide(num, den, out=np.zeros(np.broadcast(num, den).shape), where=den > 0)
+
+def freq_features(counts, lengths, chars):
+    L = lengths.astype(np.float64)
+    return {f'freq_{ch}': _safe_divide(counts[:, ord(ch)], L) for ch in chars}
+
+def general_features(counts, lengths):
+    p = _safe_divide(counts, lengths[:, None].astype(np.float64))
+    plogp = np.zeros_like(p)
+    np.log2(p, out=plogp, where=p > 0)
+    return {
+        'length': lengths,
+        'unique_chars': np.count_nonzero(counts, axis=1),
+        'entropy': -(p * plogp).sum(axis=1),
+    }
+
+def ascii_features(counts, lengths):
+    L = lengths.astype(np.float64)
+    present = counts > 0
+    mean = _safe_divide(counts @ BYTE_VALUES, L)
+    var = _safe_divide((counts * (BYTE_VALUES - mean[:, None]) ** 2).sum(axis=1), L)
+    empty = lengths == 0
+    return {
+        'ascii_mean': mean,
+        'ascii_std': np.sqrt(var),
+        'ascii_min': np.where(empty, 0, present.argmax(axis=1)),
+        'ascii_max': np.where(empty, 0, 255 - present[:, ::-1].argmax(axis=1)),
+    }
+
+def char_type_features(counts, lengths):
+    total = np.where(lengths == 0, 1, lengths).astype(np.float64)
+    return {
+        'digit_ratio': (counts @ IS_DIGIT) / total,
+        'alpha_ratio': (counts @ IS_ALPHA) / total,
+        'symbol_ratio': (counts @ NOT_ALNUM) / total,
+    }
+
+def base64_features(counts, lengths):
+    return {
+        'equals_count': counts[:, ord('=')],
+        'plus_count': counts[:, ord('+')],
+        'slash_count': counts[:, ord('/')],
+        'equals_ratio': _safe_divide(counts[:, ord('=')], lengths.astype(np.float64)),
+    }
+
+def ic_batch(counts, lengths):
+    L = lengths.astype(np.float64)
+    return _safe_divide((counts * (counts - 1)).sum(axis=1), L * (L - 1))
+
+def histogram_features(counts, lengths):
+    """Every histogram-only column (frequencies through IC) at once."""
+    features = freq_features(counts, lengths, CHAR_POOL)
+    for group in (general_features, ascii_features, char_type_features, base64_features):
+        features.update(group(counts, lengths))
+    features['IC'] = 1000 * ic_batch(counts, lengths)
+    return features
+
+def nomor_batch(counts, positions):
+    # get_nomor assigns (not adds) per letter while walking Counter(text),
+    # so when both cases occur the one that appears first is overwritten.
+    upper_first = positions[:, UPPER_CODES] > positions[:, LOWER_CODES]
+    freq_array = np.where(upper_first, counts[:, UPPER_CODES], counts[:, LOWER_CODES])
+    freq_order = np.argsort(-freq_array.astype(np.float64), axis=1) + 1
+    return np.abs(english_freq_list[:20] - freq_order[:, :20]).sum(axis=1)
+
+def chi_square_batch(counts, lengths):
+    expected = REL_FREQ * lengths[:, None].astype(np.float64)
+    observed = counts[:, UPPER_CODES]
+    return _safe_divide((observed - expected) ** 2, expected).sum(axis=1)
+
+# -----------------------------------------
+# 🧱 Feature groups (see feature_schema.FEATURE_GROUPS)
+# -----------------------------------------
+
+class Chunk:
+    """One chunk of texts; shared intermediates are computed on first use."""
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.matrix, self.lengths, self.fallback = encode_batch(texts)
+
+    def __len__(self):
+        return len(self.texts)
+
+    @cached_property
+    def counts(self):
+        return byte_histograms(self.matrix, self.lengths)
+
+    @cached_property
+    def positions(self):
+        return first_positions(self.matrix, self.lengths)
+
+    @cached_property
+    def digraphs(self):
+        return digraph_pairs(self.matrix.astype(np.int64) - 65, self.lengths)
+
+def _periodic_group(chunk):
+    mic, mka = periodic_features_batch(chunk.matrix, chunk.lengths)
+    return {'MIC': 1000 * mic, 'MKA': 1000 * mka}
+
+def _ngram_group(chunk):
+    dic, edi, lr = ngram_features_batch(chunk.matrix, chunk.lengths)
+    return {'DIC': 10000 * dic, 'EDI': edi, 'LR': lr}
+
+def _rdi_group(chunk):
+    first, second, pair, count = chunk.digraphs
+    logdi, _ = default_tables()
+    rdi = digraph_mean(logdi, second, first, pair, count)
+    return {'RDI': 100 * np.where(chunk.lengths % 2 == 0, rdi, 0.0)}
+
+GROUP_EXTRACTORS = {
+    'freq_lower': lambda c: freq_features(c.counts, c.lengths, string.ascii_lowercase),
+    'freq_upper': lambda c: freq_features(c.counts, c.lengths, string.ascii_uppercase),
+    'freq_digit': lambda c: freq_features(c.counts, c.lengths, string.digits),
+    'freq_punct': lambda c: freq_features(c.counts, c.lengths, string.punctuation),
+    'general': lambda c: general_features(c.counts, c.lengths),
+    'ascii': lambda c: ascii_features(c.counts, c.lengths),
+    'char_types': lambda c: char_type_features(c.counts, c.lengths),
+    'base64': lambda c: base64_features(c.counts, c.lengths),
+    'IC': lambda c: {'IC': 1000 * ic_batch(c.counts, c.lengths)},
+    'periodic': _periodic_group,
+    'ngram': _ngram_group,
+    'LDI': lambda c: {'LDI': 100 * digraph_mean(default_tables()[0], *c.digraphs)},
+    'SDD': lambda c: {'SDD': 100 * digraph_mean(default_tables()[1], *c.digraphs)},
+    'NOMOR': lambda c: {'NOMOR': nomor_batch(c.counts, c.positions)},
+    'RDI': _rdi_group,
+    'ChiSquare': lambda c: {'ChiSquare': chi_square_batch(c.counts, c.lengths)},
+}
+
+# -----------------------------------------
+# 🧠 Batch Feature Extractor
+# -----------------------------------------
+
+def chunk_bounds(texts, batch_size=DEFAULT_BATCH_SIZE):
+    """(start, stop) of consecutive chunks of at most ``batch_size`` texts
+    whose padded size (rows x longest) stays under MAX_CHUNK_CHARS."""
+    start = 0
+    while start < len(texts):
+        stop, longest = start, 0
+        while stop < len(texts) and stop - start < batch_size:
+            longest = max(longest, len(texts[stop]))
+            if stop > start and longest * (stop - start + 1) > MAX_CHUNK_CHARS:
+                break
+            stop += 1
+        yield start, stop
+        start = stop
+
+def _chunk_features(texts, columns):
+    """Feature arrays of one chunk, and the rows left to the per-text fallback."""
+    chunk = Chunk(texts)
+    features = {}
+    for group in groups_for(columns):
+        features.update(GROUP_EXTRACTORS[group](chunk))
+    return features, chunk.fallback
+
+def _extract_chunk(texts, columns):
+    import pandas as pd
+
+    features, fallback = _chunk_features(texts, columns)
+    frame = pd.DataFrame({c: features[c] for c in columns})
+    if fallback:
+        rows = pd.DataFrame([extract_features(texts[i]) for i in fallback], index=fallback)
+        frame.loc[fallback] = rows[columns]
+    return frame
+
+def extract_features_batch(texts, batch_size=DEFAULT_BATCH_SIZE, columns=None):
+    """Vectorized ``extract_features`` over a sequence of texts.
+
+    Returns a DataFrame with the same columns (and column order) as
+    ``pd.DataFrame([extract_features(t) for t in texts])``, or just
+    ``columns`` -- then only the feature groups those columns belong to are
+    computed.
+    """
+    import pandas as pd
+
+    texts = [str(t) for t in texts]
+    columns = list(FEATURE_COLUMNS if columns is None else columns)
+    frames = [_extract_chunk(texts[start:stop], columns) for start, stop in chunk_bounds(texts, batch_size)]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+def extract_features_array(texts, batch_size=DEFAULT_BATCH_SIZE, columns=None, dtype=np.float64):
+    """``extract_features_batch`` as a C-contiguous 2-D array, without pandas.
+
+    Same values, shape (len(texts), len(columns)); this is the inference
+    path, where building a DataFrame only to convert it back costs time and
+    the pandas import alone is most of a cold start.
+    """
+    texts = [str(t) for t in texts]
+    columns = list(FEATURE_COLUMNS if columns is None else columns)
+    out = np.empty((len(texts), len(columns)), dtype=dtype)
+    for start, stop in chunk_bounds(texts, batch_size):
+        batch = texts[start:stop]
+        features, fallback = _chunk_features(batch, columns)
+        block = out[start:stop]
+        for j, column in enumerate(columns):
+            block[:, j] = features[column]
+        for i in fallback:
+            row = extract_features(batch[i])
+            block[i] = [row[column] for column in columns]
+    return out
+
+def extract_features_frame(df, batch_size=DEFAULT_BATCH_SIZE, cache=None):
+    """Features for a raw dataset frame (``text``/``ciphertext`` + ``label``).
+
+    With a ``feature_cache.FeatureCache``, repeated texts are looked up
+    instead of recomputed.
+    """
+    texts = df['text'] if 'text' in df.columns else df['ciphertext']
+    texts = [normalize_text(t) for t in texts]  # same normalization as at prediction time
+    if cache is not None:
+        from feature_cache import extract_features_cached
+        feature_df = extract_features_cached(texts, cache, batch_size)
+    else:
+        feature_df = extract_features_batch(texts, batch_size)
+    feature_df['label'] = df['label'].values  # Keep original label
+    return feature_df
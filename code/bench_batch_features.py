@@ -0,0 +1,42 @@
+import argparse
+
+from batch_features import extract_features_batch
+from bench_suite import best_time, make_corpus
+from feature_extraction import extract_features
+from feature_schema import FEATURE_GROUPS
+
+# -----------------------------------------
+# ⏱️ extract_features_batch vs per-text extract_features
+# -----------------------------------------
+# The batch engine's acceptance bar is TARGET_SPEEDUP over calling
+# extract_features row by row. Both run on the same seeded cipher corpus
+# (the per-text loop on the first --sample texts, it is slow), and the
+# batch time is broken down by feature group to show where it goes (each
+# group is timed alone, so every share includes encoding the texts).
+
+TARGET_SPEEDUP = 50
+
+def main():
+    parser = argparse.ArgumentParser(description="Time extract_features_batch against per-text extract_features")
+    parser.add_argument("--rows", type=int, default=8000, help="corpus size (texts)")
+    parser.add_argument("--sample", type=int, default=2000, help="texts for the per-text timing")
+    parser.add_argument("--repeat", type=int, default=3, help="take the best of this many runs")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    texts, _ = make_corpus(args.rows, seed=args.seed)
+    sample = texts[:args.sample]
+    per_text = 1e6 * best_time(lambda: [extract_features(t) for t in sample], args.repeat) / len(sample)
+    batch = 1e6 * best_time(lambda: extract_features_batch(texts), args.repeat) / len(texts)
+
+    print(f"rows={len(texts)} sample={len(sample)} (best of {args.repeat})")
+    print(f"extract_features (per text)  {per_text:8.1f} us/text")
+    print(f"extract_features_batch       {batch:8.1f} us/text")
+    print(f"speedup                      {per_text / batch:8.1f}x (target {TARGET_SPEEDUP}x)")
+    print("\nbatch time by feature group:")
+    for group, columns in FEATURE_GROUPS.items():
+        seconds = best_time(lambda: extract_features_batch(texts, columns=columns), args.repeat)
+        print(f"  {group:12} {1e6 * seconds / len(texts):8.1f} us/text {100 * 1e6 * seconds / len(texts) / batch:5.0f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+
+import numpy as np
+
+from bench_suite import best_time, make_corpus
+from ciphers import CIPHERS, check_cipher_names
+from feature_schema import BYTE_FEATURE_COLUMNS, FEATURE_COLUMNS, feature_matrix
+
+# -----------------------------------------
+# ⏱️ Text features vs byte-mode features: cost and accuracy
+# -----------------------------------------
+# Same seeded corpus, same RandomForest, first 75% of the rows to train and
+# the rest to test; only the feature family differs.
+
+DEFAULT_CIPHERS = ["Plaintext", "Caesar", "Vigenere", "AES", "AES-CBC", "DES", "3DES", "RC4", "XOR"]
+
+def main():
+    from sklearn.ensemble import RandomForestClassifier
+
+    parser = argparse.ArgumentParser(description="Compare byte-mode features with the text features")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--ciphers", nargs="+", default=DEFAULT_CIPHERS, choices=list(CIPHERS), metavar="NAME")
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    try:
+        check_cipher_names(args.ciphers)
+    except ValueError as e:
+        parser.error(str(e))
+
+    texts, labels = make_corpus(args.rows, ciphers=args.ciphers, seed=args.seed)
+    labels = np.asarray(labels)
+    split = len(texts) * 3 // 4
+
+    print(f"rows={len(texts)} ciphers={','.join(args.ciphers)}")
+    print(f"{'mode':8} {'columns':>8} {'extract us/text':>16} {'accuracy':>9}")
+    for mode, columns in (("text", FEATURE_COLUMNS), ("bytes", BYTE_FEATURE_COLUMNS)):
+        seconds = best_time(lambda: feature_matrix(texts, columns=columns), args.repeat)
+        X = feature_matrix(texts, columns=columns)
+        clf = RandomForestClassifier(n_estimators=args.trees, random_state=args.seed, n_jobs=-1)
+        clf.fit(X[:split], labels[:split])
+        accuracy = (clf.predict(X[split:]) == labels[split:]).mean()
+        print(f"{mode:8} {len(columns):8d} {1e6 * seconds / len(texts):16.1f} {accuracy:9.4f}")
+
+if __name__ == "__main__":
+    main()
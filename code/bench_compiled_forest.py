@@ -0,0 +1,52 @@
+import argparse
+import random
+
+import numpy as np
+
+from bench_suite import best_time, make_corpus
+from compiled_forest import export_forest
+from feature_schema import FEATURE_COLUMNS, feature_matrix
+
+# -----------------------------------------
+# ⏱️ Micro-benchmark: sklearn RandomForest vs CompiledForest
+# -----------------------------------------
+# Model time only: both get the same precomputed features, sklearn as the
+# DataFrame it was fitted on, the compiled forest as the float32 ndarray.
+
+def main():
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import LabelEncoder
+
+    parser = argparse.ArgumentParser(description="Compare CompiledForest with sklearn predict_proba")
+    parser.add_argument("--rows", type=int, default=20_000, help="training corpus size (texts)")
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    texts, labels = make_corpus(args.rows, seed=args.seed)
+    X = feature_matrix(texts)
+    frame = pd.DataFrame(X, columns=FEATURE_COLUMNS)
+    y = LabelEncoder().fit_transform(labels)
+    clf = RandomForestClassifier(n_estimators=args.trees, random_state=args.seed, n_jobs=1).fit(frame, y)
+    compiled = export_forest(clf)
+    print(f"trees={compiled.n_estimators} nodes={len(compiled.feature):,}")
+
+    # Identical predictions and probabilities on the whole corpus
+    ref, new = clf.predict_proba(frame), compiled.predict_proba(X)
+    assert np.array_equal(ref.argmax(axis=1), new.argmax(axis=1))
+    assert np.allclose(ref, new, rtol=0, atol=1e-12), np.abs(ref - new).max()
+
+    rng = random.Random(args.seed)
+    print(f"{'batch':>8} {'sklearn ms':>12} {'compiled ms':>12} {'speedup':>8}")
+    for size in args.batch_sizes:
+        rows = [rng.randrange(len(X)) for _ in range(size)]
+        batch, batch_frame = X[rows], frame.iloc[rows]
+        calls = max(3, min(50, 10_000 // size))
+        old = 1e3 * best_time(lambda: clf.predict_proba(batch_frame), calls)
+        new = 1e3 * best_time(lambda: compiled.predict_proba(batch), calls)
+        print(f"{size:8d} {old:12.3f} {new:12.3f} {old / new:7.1f}x")
+
+if __name__ == "__main__":
+    main()
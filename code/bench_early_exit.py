@@ -0,0 +1,78 @@
+import argparse
+import math
+import random
+import time
+
+import numpy as np
+
+from bench_suite import WORDS, sentence_lengths
+from ciphers import CIPHERS, check_cipher_names, encrypt_group, interleave
+from feature_schema import feature_frame, stamp_model
+from predictor import DEFAULT_PREFIX_SIZES, Predictor
+
+# -----------------------------------------
+# ⏱️ Early exit: accuracy vs characters read
+# -----------------------------------------
+# Long payloads (lognormal lengths between --min-length and --max-length),
+# a forest trained on the same prefixes the early exit will show it, and
+# then for each threshold: accuracy, mean characters read and time per
+# text, next to classifying every text whole. Pick the threshold (and the
+# prefix sizes) where accuracy stops improving.
+
+DEFAULT_CIPHERS = ["Plaintext", "Caesar", "Vigenere", "AES", "RC4", "XOR"]
+DEFAULT_THRESHOLDS = [0.6, 0.7, 0.8, 0.9, 0.95]
+
+def long_corpus(rows, low, high, ciphers, seed):
+    rng = random.Random(seed)
+    sentences = [" ".join(rng.choices(WORDS, k=length // 4 + 1))[:length]
+                 for length in sentence_lengths(math.ceil(rows / len(ciphers)), low, high, "lognormal", rng)]
+    pairs = interleave(len(sentences), ciphers, encrypt_group(sentences, ciphers, seed=seed))[:rows]
+    return [text for text, _ in pairs], np.array([label for _, label in pairs])
+
+def main():
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import LabelEncoder
+
+    parser = argparse.ArgumentParser(description="Accuracy vs characters read for prefix early exit")
+    parser.add_argument("--rows", type=int, default=1200)
+    parser.add_argument("--min-length", type=int, default=1000, help="shortest plaintext (chars)")
+    parser.add_argument("--max-length", type=int, default=200_000, help="longest plaintext (chars)")
+    parser.add_argument("--ciphers", nargs="+", default=DEFAULT_CIPHERS, choices=list(CIPHERS), metavar="NAME")
+    parser.add_argument("--prefix-sizes", type=int, nargs="+", default=list(DEFAULT_PREFIX_SIZES))
+    parser.add_argument("--thresholds", type=float, nargs="+", default=DEFAULT_THRESHOLDS)
+    parser.add_argument("--trees", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    try:
+        check_cipher_names(args.ciphers)
+    except ValueError as e:
+        parser.error(str(e))
+
+    texts, labels = long_corpus(args.rows, args.min_length, args.max_length, args.ciphers, args.seed)
+    split = len(texts) // 2
+    train = [t[:size] for size in args.prefix_sizes + [None] for t in texts[:split]]
+    label_encoder = LabelEncoder().fit(labels)
+    y = label_encoder.transform(np.tile(labels[:split], len(args.prefix_sizes) + 1))
+    clf = RandomForestClassifier(n_estimators=args.trees, random_state=args.seed, n_jobs=-1)
+    clf.fit(feature_frame(train), y)
+    predictor = Predictor(stamp_model(clf), label_encoder)
+
+    test, truth = texts[split:], labels[split:]
+    total = sum(len(t) for t in test)
+    print(f"test texts={len(test)} mean length={total / len(test):,.0f} chars, prefixes={args.prefix_sizes}")
+    print(f"{'threshold':>10} {'accuracy':>9} {'chars read':>11} {'of total':>9} {'ms/text':>8}")
+
+    start = time.perf_counter()
+    predicted, _ = predictor.predict_proba(test)
+    elapsed = time.perf_counter() - start
+    print(f"{'whole':>10} {np.mean(np.array(predicted) == truth):9.4f} {total / len(test):11,.0f} {1:9.1%} "
+          f"{1e3 * elapsed / len(test):8.2f}")
+    for threshold in args.thresholds:
+        start = time.perf_counter()
+        predicted, _, read = predictor.predict_proba_early(test, args.prefix_sizes, threshold)
+        elapsed = time.perf_counter() - start
+        print(f"{threshold:10.2f} {np.mean(np.array(predicted) == truth):9.4f} {read.mean():11,.0f} "
+              f"{read.sum() / total:9.1%} {1e3 * elapsed / len(test):8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from batch_features import extract_features_batch
+from bench_fused import make_texts
+from feature_store import FeatureStoreWriter, load_feature_frame
+
+# -----------------------------------------
+# 💾 Load time and disk size: features CSV vs feature store
+# -----------------------------------------
+
+def make_feature_frame(rows, distinct=2000):
+    # Real feature rows for a few thousand texts, tiled up to the target size
+    base = extract_features_batch(make_texts(distinct))
+    base["label"] = np.where(np.arange(len(base)) % 2, "AES", "Plaintext")
+    return base.iloc[np.arange(rows) % len(base)].reset_index(drop=True)
+
+def dir_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare loading features from CSV and from the feature store")
+    parser.add_argument("--rows", type=int, default=404_000)
+    args = parser.parse_args()
+
+    df = make_feature_frame(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "encrypted_features.csv")
+        store_path = os.path.join(tmp, "store")
+        df.to_csv(csv_path, index=False)
+        with FeatureStoreWriter(store_path) as store:
+            for start in range(0, len(df), 50_000):
+                store.append(df.iloc[start:start + 50_000])
+
+        # Load and touch every value, as training would
+        feature_columns = [c for c in df.columns if c != "label"]
+        _, csv_time = timed(lambda: pd.read_csv(csv_path)[feature_columns].to_numpy().sum())
+        _, open_time = timed(lambda: load_feature_frame(store_path))
+        _, store_time = timed(lambda: load_feature_frame(store_path)[feature_columns].to_numpy().sum())
+
+        print(f"rows={len(df)} columns={len(feature_columns)}")
+        print(f"{'':14} {'size MB':>9} {'load+scan s':>12}")
+        print(f"{'CSV':14} {dir_size(csv_path) / 1e6:>9.1f} {csv_time:>12.3f}")
+        print(f"{'feature store':14} {dir_size(store_path) / 1e6:>9.1f} {store_time:>12.3f}")
+        print(f"feature store open only (no scan): {open_time * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
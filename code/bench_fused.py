@@ -0,0 +1,61 @@
+import argparse
+import base64
+import math
+import random
+import time
+
+from feature_extraction import extract_features
+from fused_features import extract_features_fused
+
+# -----------------------------------------
+# ⏱️ Micro-benchmark: extract_features vs extract_features_fused
+# -----------------------------------------
+
+WORDS = ("the quick brown fox jumps over a lazy dog attack at dawn data is "
+         "power encrypt the message cryptography is fun hello world").split()
+
+def make_texts(n, seed=0):
+    rng = random.Random(seed)
+    texts = []
+    for i in range(n):
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 16)))[:100]
+        if i % 2:
+            texts.append(base64.b64encode(rng.randbytes(len(sentence))).decode().upper())
+        else:
+            texts.append(sentence.upper())
+    return texts
+
+def best_of(fn, texts, repeat):
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the fused extractor with extract_features")
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts)
+
+    # Same columns, same values (up to float summation order)
+    for text in texts[:200]:
+        ref, fused = extract_features(text), extract_features_fused(text)
+        assert list(ref) == list(fused)
+        for key in ref:
+            assert math.isclose(ref[key], fused[key], rel_tol=1e-9, abs_tol=1e-9), (text, key)
+
+    old = best_of(extract_features, texts, args.repeat)
+    new = best_of(extract_features_fused, texts, args.repeat)
+    per_text = 1e6 / len(texts)
+    print(f"texts={len(texts)} (best of {args.repeat})")
+    print(f"extract_features        {old * per_text:8.1f} us/text")
+    print(f"extract_features_fused  {new * per_text:8.1f} us/text")
+    print(f"speedup                 {old / new:8.2f}x")
+
+if __name__ == "__main__":
+    main()
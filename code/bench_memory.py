@@ -0,0 +1,88 @@
+import argparse
+import base64
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+
+# -----------------------------------------
+# 📏 Peak-memory benchmark: whole-file vs streaming
+# -----------------------------------------
+# Each (stage, mode, size) runs in a fresh interpreter so ru_maxrss is the
+# peak of that run alone. Streaming should stay flat as the input grows;
+# the whole-file path grows linearly.
+
+WORDS = ("the quick brown fox jumps over a lazy dog attack at dawn data is "
+         "power encrypt the message cryptography is fun hello world").split()
+
+def make_sentences_csv(path, rows, seed=0):
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        f.write("sentence\n")
+        for _ in range(rows):
+            f.write(" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 16))) + "\n")
+
+def make_texts_csv(path, rows, seed=0):
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        f.write("text,label\n")
+        for i in range(rows):
+            if i % 2:
+                text = base64.b64encode(rng.randbytes(rng.choice((16, 32, 48)))).decode()
+                f.write(f"{text},AES\n")
+            else:
+                f.write(" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 16))) + ",Plaintext\n")
+
+def _run_one(stage, mode, input_csv, output_csv, chunksize):
+    import pandas as pd
+
+    if stage == "dataset":
+        from encryption import encrypt_sentences as transform
+    else:
+        from batch_features import extract_features_frame as transform
+
+    if mode == "eager":
+        transform(pd.read_csv(input_csv)).to_csv(output_csv, index=False)
+    else:
+        from streaming import stream_transform
+        stream_transform(input_csv, output_csv, transform, chunksize=chunksize)
+
+    # Linux reports KiB
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+
+def measure(stage, mode, input_csv, chunksize):
+    with tempfile.TemporaryDirectory() as tmp:
+        out = subprocess.run(
+            [sys.executable, __file__, "--_child", stage, mode, input_csv,
+             os.path.join(tmp, "out.csv"), str(chunksize)],
+            check=True, capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+    return float(out.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of whole-file vs streaming CSV processing")
+    parser.add_argument("--stage", choices=["dataset", "features"], default="features")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 40_000, 160_000])
+    parser.add_argument("--chunksize", type=int, default=5_000)
+    args = parser.parse_args()
+
+    make_input = make_sentences_csv if args.stage == "dataset" else make_texts_csv
+    print(f"stage={args.stage} chunksize={args.chunksize}")
+    print(f"{'rows':>10} {'eager MB':>10} {'streaming MB':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.sizes:
+            input_csv = os.path.join(tmp, f"input_{rows}.csv")
+            make_input(input_csv, rows)
+            eager = measure(args.stage, "eager", input_csv, args.chunksize)
+            streaming = measure(args.stage, "streaming", input_csv, args.chunksize)
+            print(f"{rows:>10} {eager:>10.1f} {streaming:>13.1f}")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--_child":
+        stage, mode, input_csv, output_csv, chunksize = sys.argv[2:7]
+        _run_one(stage, mode, input_csv, output_csv, int(chunksize))
+    else:
+        main()
@@ -0,0 +1,64 @@
+import argparse
+import asyncio
+import json
+
+from async_classifier import StreamClassifier, serve_tcp
+from load_generator import make_payloads, send_lines
+
+# -----------------------------------------
+# ⏱️ Streaming classifier under synthetic load
+# -----------------------------------------
+# Starts the classifier on a local port and drives it with the load
+# generator at each --rates value. For each step it reports the rate
+# actually sent, the sustained throughput (first arrival to last result)
+# and the latency percentiles (line read to result). If the achieved rate
+# falls short of the target, backpressure throttled the sender: the
+# classifier is saturated.
+
+async def bench(args):
+    texts = [text for text, _ in make_payloads(args.rows, seed=args.seed)]
+    classifier = await StreamClassifier(args.model, args.encoder, workers=args.workers,
+                                        max_batch_size=args.max_batch, max_wait_ms=args.max_wait_ms,
+                                        queue_size=args.queue_size).start()
+    server = await serve_tcp(classifier, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    results = []
+    print(f"{'target/s':>9} {'sent/s':>9} {'done/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    try:
+        for rate in args.rates:
+            classifier.reset_stats()
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            sent = await send_lines(writer, texts, rate, args.duration)
+            sent_rate = sent / (loop.time() - start)
+            writer.close()
+            await classifier.drain()
+            stats = classifier.stats()
+            results.append({"target_rate": rate, "sent_rate": round(sent_rate, 1), **stats})
+            print(f"{rate:9.0f} {sent_rate:9.0f} {stats.get('rows_per_s') or 0:9.0f} {stats.get('p50_ms', 0):8.2f} "
+                  f"{stats.get('p99_ms', 0):8.2f} {stats.get('max_ms', 0):8.2f}")
+    finally:
+        server.close()
+        await classifier.close()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and tail latency of the streaming classifier")
+    parser.add_argument("--model", required=True)
+    parser.add_argument("--encoder")
+    parser.add_argument("--rates", type=float, nargs="+", default=[500, 2000, 8000, 32000], help="lines/s steps")
+    parser.add_argument("--duration", type=float, default=5, help="seconds per step")
+    parser.add_argument("--rows", type=int, default=10_000, help="distinct payloads, cycled")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--queue-size", type=int, default=8192)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the per-step results as JSON here")
+    asyncio.run(bench(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
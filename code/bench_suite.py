@@ -0,0 +1,199 @@
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+
+import feature_extraction as fe
+from batch_features import extract_features_batch
+from ciphers import CIPHERS, DEFAULT_CIPHERS, check_cipher_names, encrypt_group, interleave
+from feature_schema import FEATURE_SCHEMA_VERSION, feature_frame, normalize_text
+from fused_features import extract_features_fused
+
+# -----------------------------------------
+# 🏁 Benchmark suite with regression tracking
+# -----------------------------------------
+# Times every extract_features helper, whole-text extraction (per text,
+# fused, batch), training, and Predictor latency (sklearn and compiled
+# forest) at several batch sizes on a seeded synthetic corpus. Results are
+# written as JSON; --compare fails (exit 1) when any stage got slower than
+# the baseline by more than --threshold. Every value is a time, lower is
+# better.
+
+WORDS = ("the quick brown fox jumps over a lazy dog attack at dawn data is power "
+         "encrypt the message cryptography is fun hello world zebra quiz").split()
+
+DEFAULT_BATCH_SIZES = [1, 10, 100, 1000, 10_000]
+
+# -----------------------------------------
+# 🧪 Synthetic corpus
+# -----------------------------------------
+
+def sentence_lengths(n, low, high, distribution, rng):
+    if distribution == "uniform":
+        return [rng.randint(low, high) for _ in range(n)]
+    # lognormal around the geometric mean of the range, clipped to it
+    mu = (math.log(low) + math.log(high)) / 2
+    sigma = (math.log(high) - math.log(low)) / 4
+    return [min(high, max(low, round(rng.lognormvariate(mu, sigma)))) for _ in range(n)]
+
+def make_corpus(rows, low=10, high=100, distribution="uniform", ciphers=DEFAULT_CIPHERS, seed=0):
+    """(texts, labels): sentences of the given length distribution, each
+    encrypted with every cipher in ``ciphers`` (seeded keys)."""
+    rng = random.Random(seed)
+    sentences = []
+    for length in sentence_lengths(math.ceil(rows / len(ciphers)), low, high, distribution, rng):
+        words = []
+        while sum(len(w) + 1 for w in words) <= length:
+            words.append(rng.choice(WORDS))
+        sentences.append(" ".join(words)[:length])
+    results = encrypt_group(sentences, ciphers, seed=seed)
+    pairs = interleave(len(sentences), ciphers, results)[:rows]
+    return [text for text, _ in pairs], [label for _, label in pairs]
+
+# -----------------------------------------
+# ⏱️ Timing
+# -----------------------------------------
+
+def best_time(fn, repeat):
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def per_text_us(fn, texts, repeat):
+    return 1e6 * best_time(lambda: [fn(t) for t in texts], repeat) / len(texts)
+
+def run_suite(args):
+    texts, labels = make_corpus(args.rows, args.min_length, args.max_length, args.distribution, args.ciphers, args.seed)
+    texts = [normalize_text(t) for t in texts]
+    sample = texts[:args.sample]
+    results = {}
+
+    def record(stage, value, unit):
+        results[stage] = {"value": value, "unit": unit}
+        print(f"  {stage:28} {value:12.3f} {unit}", file=sys.stderr)
+
+    for name in fe.FEATURE_FUNCTIONS:
+        record(f"helper.{name}", per_text_us(getattr(fe, name), sample, args.repeat), "us/text")
+
+    record("extract.per_text", per_text_us(fe.extract_features, sample, args.repeat), "us/text")
+    record("extract.fused", per_text_us(extract_features_fused, sample, args.repeat), "us/text")
+    batch_time = best_time(lambda: extract_features_batch(texts), args.repeat)
+    record("extract.batch", 1e6 * batch_time / len(texts), "us/text")
+
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import LabelEncoder
+    from compiled_forest import export_forest
+    from feature_schema import stamp_model
+    from predictor import Predictor
+
+    X = feature_frame(texts)
+    label_encoder = LabelEncoder()
+    y = label_encoder.fit_transform(labels)
+    clf = RandomForestClassifier(n_estimators=args.trees, random_state=args.seed, n_jobs=1)
+    record("train.fit", best_time(lambda: clf.fit(X, y), 1), "s")
+
+    predictor = Predictor(stamp_model(clf), label_encoder)
+    compiled = Predictor(export_forest(clf), label_encoder)
+    rng = random.Random(args.seed)
+    for size in args.batch_sizes:
+        batch = [rng.choice(texts) for _ in range(size)]
+        calls = max(3, min(50, 10_000 // size))
+        record(f"predict.batch_{size}", 1e3 * best_time(lambda: predictor.predict_proba(batch), calls), "ms/call")
+        record(f"predict_compiled.batch_{size}", 1e3 * best_time(lambda: compiled.predict_proba(batch), calls),
+               "ms/call")
+    return results
+
+# -----------------------------------------
+# 📊 Comparison
+# -----------------------------------------
+
+def compare(baseline, current, threshold):
+    """Print old vs new per stage; return (stages slower by more than ``threshold``,
+    baseline stages the current run no longer has)."""
+    if baseline["config"] != current["config"]:
+        print("warning: baseline was run with a different configuration", file=sys.stderr)
+    regressions = []
+    print(f"{'stage':28} {'baseline':>12} {'current':>12} {'change':>8}")
+    for stage, new in current["results"].items():
+        old = baseline["results"].get(stage)
+        if old is None:
+            print(f"{stage:28} {'-':>12} {new['value']:12.3f}      new")
+            continue
+        change = new["value"] / old["value"] - 1 if old["value"] > 0 else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(stage)
+            flag = "  REGRESSION"
+        print(f"{stage:28} {old['value']:12.3f} {new['value']:12.3f} {change:+8.1%}{flag}")
+    missing = [stage for stage in baseline["results"] if stage not in current["results"]]
+    for stage in missing:
+        print(f"{stage:28} {baseline['results'][stage]['value']:12.3f} {'-':>12}  MISSING")
+    return regressions, missing
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark feature extraction, training and prediction")
+    parser.add_argument("--rows", type=int, default=20_000, help="corpus size (texts)")
+    parser.add_argument("--min-length", type=int, default=10, help="shortest plaintext sentence (chars)")
+    parser.add_argument("--max-length", type=int, default=100, help="longest plaintext sentence (chars)")
+    parser.add_argument("--distribution", choices=["uniform", "lognormal"], default="uniform",
+                        help="sentence length distribution between the two bounds")
+    parser.add_argument("--ciphers", nargs="+", default=DEFAULT_CIPHERS, choices=list(CIPHERS), metavar="NAME")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sample", type=int, default=2000, help="texts for the per-text timings")
+    parser.add_argument("--repeat", type=int, default=3, help="take the best of this many runs")
+    parser.add_argument("--trees", type=int, default=100, help="RandomForest n_estimators for the training stage")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=DEFAULT_BATCH_SIZES)
+    parser.add_argument("--output", help="write the results as JSON here")
+    parser.add_argument("--results", metavar="JSON", help="compare these saved results instead of running")
+    parser.add_argument("--compare", metavar="BASELINE", help="baseline JSON; exit 1 on a regression or a missing stage")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown per stage (0.10 = 10%%)")
+    args = parser.parse_args()
+    try:
+        check_cipher_names(args.ciphers)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.results:
+        with open(args.results) as f:
+            current = json.load(f)
+    else:
+        config = {k: getattr(args, k) for k in (
+            "rows", "min_length", "max_length", "distribution", "ciphers", "seed", "sample", "repeat",
+            "trees", "batch_sizes")}
+        current = {
+            "config": config,
+            "environment": {
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "feature_schema_version": FEATURE_SCHEMA_VERSION,
+            },
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": run_suite(args),
+        }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Results saved to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions, missing = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} stage(s) slower than {args.threshold:.0%}: {', '.join(regressions)}")
+        if missing:
+            print(f"{len(missing)} baseline stage(s) missing from this run: {', '.join(missing)}")
+        if regressions or missing:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
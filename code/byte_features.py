@@ -0,0 +1,193 @@
+from functools import cached_property
+
+import numpy as np
+
+from feature_schema import BLOCK_SIZES, BYTE_COLUMN_GROUP, BYTE_FEATURE_COLUMNS, BYTE_FEATURE_GROUPS
+
+# -----------------------------------------
+# 🧬 Byte mode: decode base64/hex payloads, features of the raw bytes
+# -----------------------------------------
+# The text features look at the base64 alphabet of an AES/RC4 output
+# (uppercased, at that). Here a batch of raw texts is classified as hex,
+# base64 or plain text and decoded in bulk, and the features are computed
+# on the bytes: 256-bin histogram, byte entropy, repeated 8/16-byte blocks
+# (ECB leaks equal plaintext blocks) and the length modulo the block sizes.
+# Every step is a NumPy op over the whole batch; per-text Python is limited
+# to encoding the strings.
+
+ENCODINGS = ('raw', 'hex', 'base64')
+RAW, HEX, BASE64 = range(len(ENCODINGS))
+
+B64_ALPHABET = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+HEX_VALUE = np.full(256, -1, dtype=np.int16)
+for _i, _c in enumerate(b'0123456789abcdef'):
+    HEX_VALUE[_c] = _i
+    HEX_VALUE[ord(chr(_c).upper())] = _i
+B64_VALUE = np.full(256, -1, dtype=np.int16)
+B64_VALUE[np.frombuffer(B64_ALPHABET, dtype=np.uint8)] = np.arange(64)
+B64_VALUE[ord('=')] = 0  # padding decodes as zero bits and is trimmed afterwards
+
+def _pack(blobs):
+    """Concatenated uint8 buffer, per-blob lengths and start offsets."""
+    lengths = np.fromiter((len(b) for b in blobs), dtype=np.int64, count=len(blobs))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+    return np.frombuffer(b''.join(blobs), dtype=np.uint8), lengths, starts
+
+def _segment_ids(lengths):
+    return np.repeat(np.arange(len(lengths)), lengths)
+
+def detect_encoding(texts):
+    """ENCODINGS index per text: hex (even length, hex digits only), else
+    base64 (length % 4 == 0, base64 alphabet, at most two trailing '='),
+    else raw. Hex wins when both fit, e.g. 'DEADBEEF'."""
+    buf, lengths, starts = _pack([t.encode('ascii', 'replace') for t in texts])
+    n = len(texts)
+    ids = _segment_ids(lengths)
+    bad_hex = np.bincount(ids, weights=HEX_VALUE[buf] < 0, minlength=n)
+    bad_b64 = np.bincount(ids, weights=B64_VALUE[buf] < 0, minlength=n)
+    # '=' only as padding: with p of them, at distances 1..p from the end
+    is_pad = buf == ord('=')
+    from_end = (starts + lengths)[ids] - np.arange(len(buf))
+    pads = np.bincount(ids, weights=is_pad, minlength=n)
+    pad_distance = np.bincount(ids, weights=np.where(is_pad, from_end, 0), minlength=n)
+    padded_ok = (pads <= 2) & (pad_distance == pads * (pads + 1) / 2)
+
+    kind = np.full(n, RAW, dtype=np.int8)
+    kind[(lengths > 0) & (lengths % 4 == 0) & (bad_b64 == 0) & padded_ok] = BASE64
+    kind[(lengths > 0) & (lengths % 2 == 0) & (bad_hex == 0)] = HEX
+    return kind
+
+def _decode_hex(blobs):
+    buf, lengths, _ = _pack(blobs)
+    nibbles = HEX_VALUE[buf].astype(np.uint8).reshape(-1, 2)
+    return (nibbles[:, 0] << 4) | nibbles[:, 1], lengths // 2
+
+def _decode_base64(blobs):
+    buf, lengths, starts = _pack(blobs)
+    sextets = B64_VALUE[buf].astype(np.uint32).reshape(-1, 4)
+    words = (sextets[:, 0] << 18) | (sextets[:, 1] << 12) | (sextets[:, 2] << 6) | sextets[:, 3]
+    decoded = np.stack([words >> 16, words >> 8, words], axis=1).astype(np.uint8).ravel()
+    # Trim the bytes that only exist because of '=' padding (lengths are >= 4)
+    ends = starts + lengths
+    pads = (buf[ends - 1] == ord('=')).astype(np.int64) + (buf[ends - 2] == ord('='))
+    full = lengths // 4 * 3
+    out_lengths = full - pads
+    keep = np.arange(len(decoded)) - np.repeat(np.cumsum(full) - full, full) < np.repeat(out_lengths, full)
+    return decoded[keep], out_lengths
+
+def decode_payloads(texts):
+    """(kind, buf, lengths, starts, order): the decoded bytes of every text.
+
+    ``buf`` holds the payloads grouped by encoding; text ``order[j]`` owns
+    ``buf[starts[j]:starts[j] + lengths[j]]``.
+    """
+    kind = detect_encoding(texts)
+    parts, part_lengths, order = [], [], []
+    for code, decode in ((HEX, _decode_hex), (BASE64, _decode_base64)):
+        index = np.flatnonzero(kind == code)
+        if len(index):
+            data, lengths = decode([texts[i].encode('ascii') for i in index])
+            parts.append(data)
+            part_lengths.append(lengths)
+            order.append(index)
+    index = np.flatnonzero(kind == RAW)
+    if len(index):
+        data, lengths, _ = _pack([texts[i].encode('utf-8') for i in index])
+        parts.append(data)
+        part_lengths.append(lengths)
+        order.append(index)
+    if not parts:
+        empty = np.zeros(0, dtype=np.int64)
+        return kind, np.zeros(0, dtype=np.uint8), empty, empty, empty
+    lengths = np.concatenate(part_lengths).astype(np.int64)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+    return kind, np.concatenate(parts), lengths, starts, np.concatenate(order)
+
+# -----------------------------------------
+# 📊 Feature groups
+# -----------------------------------------
+
+class Payloads:
+    """A batch of decoded texts; per-text arrays are in text order."""
+
+    def __init__(self, texts):
+        self.kind, self.buf, lengths, starts, order = decode_payloads(texts)
+        self.lengths = np.zeros(len(texts), dtype=np.int64)
+        self.starts = np.zeros(len(texts), dtype=np.int64)
+        self.lengths[order] = lengths
+        self.starts[order] = starts
+
+    def __len__(self):
+        return len(self.lengths)
+
+    @cached_property
+    def counts(self):
+        # Text ids in buffer order (the buffer is grouped by encoding)
+        by_start = np.argsort(self.starts, kind='stable')
+        ids = np.repeat(by_start, self.lengths[by_start])
+        return np.bincount(ids * 256 + self.buf, minlength=len(self) * 256).reshape(len(self), 256)
+
+    @cached_property
+    def frequencies(self):
+        return self.counts / np.maximum(self.lengths, 1)[:, None]
+
+def block_repeats(payloads, block_size):
+    """Per text, how many full ``block_size`` blocks repeat an earlier one."""
+    n_blocks = payloads.lengths // block_size
+    owner = np.repeat(np.arange(len(payloads)), n_blocks)
+    within = np.arange(len(owner)) - np.repeat(np.cumsum(n_blocks) - n_blocks, n_blocks)
+    first = payloads.starts[owner] + within * block_size
+    blocks = payloads.buf[first[:, None] + np.arange(block_size)].view('<u8')
+    order = np.lexsort(tuple(blocks.T[::-1]) + (owner,))
+    blocks, owner = blocks[order], owner[order]
+    repeat = (owner[1:] == owner[:-1]) & (blocks[1:] == blocks[:-1]).all(axis=1)
+    return np.bincount(owner[1:][repeat], minlength=len(payloads))
+
+def _entropy_group(p):
+    f = p.frequencies
+    logf = np.zeros_like(f)
+    np.log2(f, out=logf, where=f > 0)
+    return {'byte_entropy': -(f * logf).sum(axis=1)}
+
+BYTE_GROUP_EXTRACTORS = {
+    'encoding': lambda p: {f'enc_{name}': p.kind == code for code, name in enumerate(ENCODINGS)},
+    'byte_length': lambda p: {'n_bytes': p.lengths} | {f'n_bytes_mod_{b}': p.lengths % b for b in BLOCK_SIZES},
+    'byte_hist': lambda p: dict(zip(BYTE_FEATURE_GROUPS['byte_hist'], p.frequencies.T)),
+    'byte_entropy': _entropy_group,
+    'block_repeats': lambda p: {f'block_repeats_{b}': block_repeats(p, b) for b in BLOCK_SIZES},
+}
+
+# -----------------------------------------
+# 🧠 Batch extractor
+# -----------------------------------------
+
+def byte_feature_matrix(texts, batch_size=4096, columns=None, dtype=np.float64):
+    """Byte-mode features of raw (not normalized) texts, shape (len(texts), len(columns))."""
+    texts = [str(t) for t in texts]
+    columns = list(BYTE_FEATURE_COLUMNS if columns is None else columns)
+    unknown = [c for c in columns if c not in BYTE_COLUMN_GROUP]
+    if unknown:
+        raise ValueError(f"unknown byte feature columns: {', '.join(unknown)}")
+    needed = {BYTE_COLUMN_GROUP[c] for c in columns}
+    out = np.empty((len(texts), len(columns)), dtype=dtype)
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        payloads = Payloads(batch)
+        features = {}
+        for group in BYTE_FEATURE_GROUPS:
+            if group in needed:
+                features.update(BYTE_GROUP_EXTRACTORS[group](payloads))
+        block = out[start:start + len(batch)]
+        for j, column in enumerate(columns):
+            block[:, j] = features[column]
+    return out
+
+def extract_byte_features_frame(df, batch_size=4096):
+    """Byte-mode features for a raw dataset frame (``text``/``ciphertext`` + ``label``)."""
+    import pandas as pd
+
+    texts = df['text'] if 'text' in df.columns else df['ciphertext']
+    features = byte_feature_matrix(list(texts), batch_size)
+    feature_df = pd.DataFrame(features, columns=BYTE_FEATURE_COLUMNS)
+    feature_df['label'] = df['label'].values
+    return feature_df
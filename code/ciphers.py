@@ -0,0 +1,223 @@
+import base64
+import binascii
+import random
+
+from Crypto.Cipher import AES, ARC4, DES, DES3, ChaCha20
+from Crypto.Random import get_random_bytes
+from Crypto.Util.Padding import pad
+
+# -----------------------------------------
+# 🔐 Cipher registry for dataset generation
+# -----------------------------------------
+# Each generator takes (sentence, data, key) -- the sentence, its UTF-8
+# bytes and key_size random bytes -- and returns either text (classical
+# ciphers) or raw bytes, which are then written as base64 or hex. The
+# registered name is the label. ``cost`` is the measured per-sentence time
+# (microseconds, ~60-char sentences) used to balance work between processes.
+
+CIPHERS = {}
+ENCODINGS = {
+    "base64": lambda raw: base64.b64encode(raw).decode("ascii"),
+    "hex": lambda raw: binascii.hexlify(raw).decode("ascii"),
+}
+DEFAULT_CIPHERS = ["Plaintext", "Caesar", "AES", "RC4"]
+
+class CipherSpec:
+    def __init__(self, name, fn, key_size, cost):
+        self.name = name
+        self.fn = fn
+        self.key_size = key_size
+        self.cost = cost
+
+    def __repr__(self):
+        return f"CipherSpec({self.name!r}, key_size={self.key_size}, cost={self.cost})"
+
+def register_cipher(name, key_size=0, cost=1.0):
+    """Decorator adding a generator to ``CIPHERS`` under the label ``name``."""
+    def decorator(fn):
+        if name in CIPHERS:
+            raise ValueError(f"cipher {name!r} is already registered")
+        CIPHERS[name] = CipherSpec(name, fn, key_size, cost)
+        return fn
+    return decorator
+
+def check_cipher_names(names):
+    """Raise ValueError if a cipher is listed twice (its rows would be generated twice)."""
+    repeated = sorted({name for name in names if list(names).count(name) > 1})
+    if repeated:
+        raise ValueError(f"cipher listed more than once: {', '.join(repeated)}")
+    return names
+
+def get_cipher(name):
+    try:
+        return CIPHERS[name]
+    except KeyError:
+        raise ValueError(f"unknown cipher {name!r}; registered: {', '.join(CIPHERS)}") from None
+
+# -----------------------------------------
+# 📜 Classical ciphers (text in, text out)
+# -----------------------------------------
+
+class _CaesarTable(dict):
+    # str.translate looks every code point up here; each one is worked out
+    # once (same rule as the old per-char loop, including non-ASCII letters)
+    def __init__(self, shift):
+        super().__init__()
+        self.shift = shift
+
+    def __missing__(self, code):
+        char = chr(code)
+        if char.isalpha():
+            shift_base = ord('A') if char.isupper() else ord('a')
+            result = chr((code - shift_base + self.shift) % 26 + shift_base)
+        else:
+            result = char
+        self[code] = result
+        return result
+
+_caesar_tables = {}
+
+def caesar_encrypt(text, shift=3):
+    table = _caesar_tables.get(shift)
+    if table is None:
+        table = _caesar_tables[shift] = _CaesarTable(shift)
+    return text.translate(table)
+
+def vigenere_encrypt(text, shifts):
+    # Shift ASCII letters by the repeating key; other characters pass through
+    # without consuming a key position
+    out = []
+    i = 0
+    for char in text:
+        if 'a' <= char <= 'z' or 'A' <= char <= 'Z':
+            base = ord('A') if char <= 'Z' else ord('a')
+            out.append(chr((ord(char) - base + shifts[i % len(shifts)]) % 26 + base))
+            i += 1
+        else:
+            out.append(char)
+    return ''.join(out)
+
+@register_cipher("Plaintext", cost=0.5)
+def _plaintext(sentence, data, key):
+    return sentence
+
+@register_cipher("Caesar", cost=2.0)
+def _caesar(sentence, data, key):
+    return caesar_encrypt(sentence)
+
+@register_cipher("Vigenere", key_size=11, cost=12.0)
+def _vigenere(sentence, data, key):
+    length = 4 + key[0] % 7  # 4..10 letter key
+    return vigenere_encrypt(sentence, [b % 26 for b in key[1:1 + length]])
+
+# -----------------------------------------
+# 🧮 Modern ciphers (bytes out, IV/nonce prepended)
+# -----------------------------------------
+
+@register_cipher("AES", key_size=16, cost=10.0)
+def _aes_ecb(sentence, data, key):
+    return AES.new(key, AES.MODE_ECB).encrypt(pad(data, AES.block_size))
+
+@register_cipher("AES-CBC", key_size=32, cost=12.0)
+def _aes_cbc(sentence, data, key):
+    iv = key[16:]
+    return iv + AES.new(key[:16], AES.MODE_CBC, iv=iv).encrypt(pad(data, AES.block_size))
+
+@register_cipher("AES-CTR", key_size=24, cost=19.0)
+def _aes_ctr(sentence, data, key):
+    nonce = key[16:]
+    return nonce + AES.new(key[:16], AES.MODE_CTR, nonce=nonce).encrypt(data)
+
+@register_cipher("AES-GCM", key_size=28, cost=78.0)
+def _aes_gcm(sentence, data, key):
+    nonce = key[16:]
+    ciphertext, tag = AES.new(key[:16], AES.MODE_GCM, nonce=nonce).encrypt_and_digest(data)
+    return nonce + ciphertext + tag
+
+@register_cipher("DES", key_size=8, cost=19.0)
+def _des(sentence, data, key):
+    return DES.new(key, DES.MODE_ECB).encrypt(pad(data, DES.block_size))
+
+@register_cipher("3DES", key_size=24, cost=100.0)
+def _3des(sentence, data, key):
+    key = DES3.adjust_key_parity(key)
+    return DES3.new(key, DES3.MODE_ECB).encrypt(pad(data, DES3.block_size))
+
+@register_cipher("ChaCha20", key_size=40, cost=11.0)
+def _chacha20(sentence, data, key):
+    nonce = key[32:]
+    return nonce + ChaCha20.new(key=key[:32], nonce=nonce).encrypt(data)
+
+@register_cipher("RC4", key_size=16, cost=11.0)
+def _rc4(sentence, data, key):
+    return ARC4.new(key).encrypt(data)
+
+@register_cipher("XOR", key_size=8, cost=3.0)
+def _xor(sentence, data, key):
+    stream = (key * (len(data) // len(key) + 1))[:len(data)]
+    return (int.from_bytes(data, "big") ^ int.from_bytes(stream, "big")).to_bytes(len(data), "big")
+
+# Kept for callers of the original helpers
+def aes_encrypt(text, key):
+    return ENCODINGS["base64"](_aes_ecb(text, text.encode('utf-8'), key))
+
+def rc4_encrypt(text, key):
+    return ENCODINGS["base64"](_rc4(text, text.encode('utf-8'), key))
+
+# -----------------------------------------
+# ⚖️ Batch encryption and cost-balanced scheduling
+# -----------------------------------------
+
+def cipher_keys(name, n_bytes, seed=None, batch_index=0):
+    # Seeded runs derive every key from (seed, batch, cipher), so the output
+    # does not depend on how the work is split between processes
+    if seed is None:
+        return get_random_bytes(n_bytes)
+    return random.Random(f"{seed}:{batch_index}:{name}").randbytes(n_bytes)
+
+def encrypt_group(sentences, names, encoding="base64", seed=None, batch_index=0):
+    """Encrypt ``sentences`` with each cipher in ``names``; returns {name: [text, ...]}."""
+    encode = ENCODINGS[encoding]
+    data = [sentence.encode('utf-8') for sentence in sentences]
+    out = {}
+    for name in names:
+        spec = get_cipher(name)
+        size = spec.key_size
+        keys = cipher_keys(name, size * len(sentences), seed, batch_index) if size else b""
+        texts = []
+        for i, (sentence, raw) in enumerate(zip(sentences, data)):
+            result = spec.fn(sentence, raw, keys[size * i:size * (i + 1)])
+            texts.append(result if isinstance(result, str) else encode(result))
+        out[name] = texts
+    return out
+
+def plan_groups(names):
+    """Split ciphers into groups of roughly equal total cost.
+
+    Each group becomes one task per chunk. The capacity is the most expensive
+    cipher's cost, so that cipher runs alone and the cheap ones are packed
+    together (first fit, most expensive first).
+    """
+    specs = sorted((get_cipher(n) for n in names), key=lambda s: s.cost, reverse=True)
+    if not specs:
+        return []
+    capacity = specs[0].cost
+    groups = []
+    for spec in specs:
+        for group in groups:
+            if group[0] + spec.cost <= capacity:
+                group[0] += spec.cost
+                group[1].append(spec.name)
+                break
+        else:
+            groups.append([spec.cost, [spec.name]])
+    return [group_names for _, group_names in groups]
+
+def interleave(sentences_count, names, results):
+    """Rows ordered sentence by sentence, ciphers in ``names`` order."""
+    check_cipher_names(names)
+    return [
+        (results[name][i], name)
+        for i in range(sentences_count)
+        for name in names
+    ]
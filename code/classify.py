@@ -0,0 +1,140 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+from feature_cache import FeatureCache
+from predictor import (
+    Predictor, DEFAULT_ENCODER_PATH, DEFAULT_EXIT_THRESHOLD, DEFAULT_MODEL_PATH, DEFAULT_PREFIX_SIZES,
+)
+from profiling import enable as enable_profiling, stage, timed_iter, write_profile
+
+# -----------------------------------------
+# 🏷️ Bulk classification: files, directories or stdin -> CSV / JSONL
+# -----------------------------------------
+# One ciphertext per line. Lines are read lazily and classified in batches
+# (one feature extraction + one predict_proba per batch), and each batch is
+# written out before the next is read, so memory stays bounded.
+
+DEFAULT_BATCH_SIZE = 4096
+
+def iter_sources(paths):
+    """Expand paths into readable files; '-' (or nothing) means stdin."""
+    for path in paths or ["-"]:
+        if path == "-":
+            yield "-"
+        elif os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                full = os.path.join(path, name)
+                if os.path.isfile(full):
+                    yield full
+        else:
+            yield path
+
+def iter_lines(paths):
+    for source in iter_sources(paths):
+        f = sys.stdin if source == "-" else open(source, encoding="utf-8", errors="replace")
+        try:
+            for line in f:
+                line = line.rstrip("\r\n")
+                if line:
+                    yield line
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+def iter_batches(items, size):
+    items = iter(items)
+    while batch := list(islice(items, size)):
+        yield batch
+
+class CsvWriter:
+    def __init__(self, out, classes):
+        self.writer = csv.writer(out)
+        self.writer.writerow(["text", "label"] + [f"prob_{c}" for c in classes])
+
+    def write(self, texts, labels, proba):
+        self.writer.writerows(
+            [text, label] + [f"{p:.4f}" for p in row]
+            for text, label, row in zip(texts, labels, proba)
+        )
+
+class JsonlWriter:
+    def __init__(self, out, classes):
+        self.out = out
+        self.classes = classes
+
+    def write(self, texts, labels, proba):
+        for text, label, row in zip(texts, labels, proba):
+            record = {"text": text, "label": label,
+                      "probabilities": {c: round(float(p), 4) for c, p in zip(self.classes, row)}}
+            self.out.write(json.dumps(record) + "\n")
+
+WRITERS = {"csv": CsvWriter, "jsonl": JsonlWriter}
+
+def classify(predictor, paths, out, fmt="csv", batch_size=DEFAULT_BATCH_SIZE, early_exit=None,
+             prefix_sizes=DEFAULT_PREFIX_SIZES):
+    """Classify every line of ``paths`` into ``out``; returns the row count.
+
+    With ``early_exit`` (a probability threshold), long lines are classified
+    by prefix (``Predictor.predict_proba_early``).
+    """
+    writer = WRITERS[fmt](out, predictor.classes)
+    rows = 0
+    for texts in timed_iter(iter_batches(iter_lines(paths), batch_size), "load"):
+        if early_exit is None:
+            labels, proba = predictor.predict_proba(texts)
+        else:
+            labels, proba, _ = predictor.predict_proba_early(texts, prefix_sizes, early_exit)
+        with stage("write", len(texts)):
+            writer.write(texts, labels, proba)
+        rows += len(texts)
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify ciphertexts (one per line) from files, directories or stdin")
+    parser.add_argument("inputs", nargs="*", help="files or directories; '-' or nothing reads stdin")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("-f", "--format", choices=sorted(WRITERS), default="csv")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--encoder", default=DEFAULT_ENCODER_PATH)
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="in-memory LRU entries for repeated texts (0 = none; with --cache-db, disk only)")
+    parser.add_argument("--cache-db", metavar="PATH", help="sqlite feature cache reused across runs")
+    parser.add_argument("--early-exit", type=float, metavar="P",
+                        help=f"classify long lines by growing prefixes, stopping once the top probability "
+                        f"reaches P (e.g. {DEFAULT_EXIT_THRESHOLD}; see bench_early_exit.py)")
+    parser.add_argument("--prefix-sizes", type=lambda v: [int(x) for x in v.split(",")],
+                        default=list(DEFAULT_PREFIX_SIZES), metavar="N,N,...",
+                        help=f"prefix lengths for --early-exit (default: {','.join(map(str, DEFAULT_PREFIX_SIZES))})")
+    parser.add_argument("--profile", metavar="PATH", help="record per-stage and per-feature timings; write them to PATH "
+                        "(Prometheus text if it ends in .prom, '-' for stderr)")
+    args = parser.parse_args()
+
+    if args.profile:
+        enable_profiling()
+
+    cache = FeatureCache(args.cache_size, args.cache_db) if args.cache_size or args.cache_db else None
+    predictor = Predictor.load(args.model, args.encoder, cache)
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        rows = classify(predictor, args.inputs, out, args.format, args.batch_size, args.early_exit, args.prefix_sizes)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed > 0 else 0
+    print(f"Classified {rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)", file=sys.stderr)
+    if cache is not None:
+        print(f"Feature cache: {cache.stats()}", file=sys.stderr)
+        cache.close()
+    if args.profile:
+        write_profile(args.profile)
+
+if __name__ == "__main__":
+    main()
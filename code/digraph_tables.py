@@ -0,0 +1,163 @@
+import hashlib
+import os
+import warnings
+from functools import lru_cache
+
+import numpy as np
+
+# -----------------------------------------
+# 🔤 Digraph statistics tables (LDI, SDD, RDI)
+# -----------------------------------------
+# Two 26x26 tables computed from the plaintext sentence corpus:
+#   logdi[a, b]  log10 of the relative frequency of the digraph ab
+#   sdd[a, b]    log10 of how much more often ab occurs than its single
+#                letter frequencies predict, log10(P(ab) / (P(a) P(b)))
+# Digraphs are adjacent A-Z pairs of the uppercased text, the same pairs
+# get_ldi/get_sdd/get_rdi look up. Both tables are stored as one (2, 26, 26)
+# float64 .npy next to this file, memory-mapped the first time LDI, SDD or
+# RDI is computed (other feature groups never read it). Rebuild with:
+#   python digraph_tables.py --input final_dataset.csv
+# A missing file is an error: the features would silently differ from the
+# ones models were trained on. Set
+# ALLOW_MISSING_DIGRAPH_TABLES=1 to compute with zero tables instead. Stores,
+# caches and models record tables_hash(), so features computed with other
+# tables (zero tables included) are rejected rather than mixed.
+
+DEFAULT_TABLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "digraph_tables.npy")
+TABLE_SHAPE = (2, 26, 26)
+ALLOW_MISSING_ENV = "ALLOW_MISSING_DIGRAPH_TABLES"
+
+# -----------------------------------------
+# 🏗️ Building
+# -----------------------------------------
+
+def letter_codes(text):
+    """Code points of ``text`` minus ord('A'); A-Z map to 0..25."""
+    return np.frombuffer(text.encode('utf-32-le'), dtype='<u4').astype(np.int64) - 65
+
+def digraph_counts(texts):
+    """26x26 counts of adjacent uppercase letter pairs over ``texts``."""
+    # One pass over all texts; the newline separator never forms a pair
+    codes = letter_codes("\n".join(str(t) for t in texts).upper())
+    letter = (codes >= 0) & (codes < 26)
+    pair = letter[:-1] & letter[1:]
+    counts = np.bincount(codes[:-1][pair] * 26 + codes[1:][pair], minlength=26 * 26)
+    return counts.reshape(26, 26)
+
+def tables_from_counts(counts):
+    """(logdi, sdd) from digraph counts, with add-one smoothing."""
+    smoothed = counts + 1.0
+    p_pair = smoothed / smoothed.sum()
+    p_first = p_pair.sum(axis=1)
+    p_second = p_pair.sum(axis=0)
+    logdi = np.log10(p_pair)
+    sdd = np.log10(p_pair / np.outer(p_first, p_second))
+    return logdi, sdd
+
+def save_tables(logdi, sdd, path=DEFAULT_TABLES_PATH):
+    tmp_path = path + ".tmp.npy"
+    np.save(tmp_path, np.stack([logdi, sdd]).astype(np.float64))
+    os.replace(tmp_path, path)
+
+# -----------------------------------------
+# 📥 Loading
+# -----------------------------------------
+
+def load_tables(path=DEFAULT_TABLES_PATH, allow_missing=None):
+    """Memory-mapped (logdi, sdd).
+
+    A missing ``path`` raises FileNotFoundError unless ``allow_missing`` (by
+    default the ALLOW_MISSING_DIGRAPH_TABLES environment variable) is set,
+    in which case zero tables are returned with a warning.
+    """
+    if not os.path.exists(path):
+        if allow_missing is None:
+            allow_missing = os.environ.get(ALLOW_MISSING_ENV, "") not in ("", "0")
+        hint = "Build them with: python digraph_tables.py --input <sentences.csv>"
+        if not allow_missing:
+            raise FileNotFoundError(
+                f"digraph tables not found at {path}. {hint} "
+                f"(or set {ALLOW_MISSING_ENV}=1 to compute LDI, SDD and RDI as 0)"
+            )
+        warnings.warn(f"digraph tables not found at {path}; LDI, SDD and RDI will be 0. {hint}", stacklevel=2)
+        return np.zeros((26, 26)), np.zeros((26, 26))
+    tables = np.load(path, mmap_mode="r")
+    if tables.shape != TABLE_SHAPE:
+        raise ValueError(f"{path} holds an array of shape {tables.shape}, expected {TABLE_SHAPE}")
+    # Plain ndarray views of the mapping; indexing an np.memmap is slower
+    return np.asarray(tables[0]), np.asarray(tables[1])
+
+@lru_cache(maxsize=None)
+def default_tables():
+    """``load_tables()``, loaded once on first use."""
+    return load_tables()
+
+@lru_cache(maxsize=None)
+def tables_hash(path=DEFAULT_TABLES_PATH):
+    """Short digest of the tables ``load_tables(path)`` returns (zero tables included)."""
+    logdi, sdd = load_tables(path)
+    data = np.stack([logdi, sdd]).astype("<f8").tobytes()
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+# -----------------------------------------
+# 📦 Lookups over integer-encoded digraphs
+# -----------------------------------------
+
+def digraph_pairs(codes, lengths):
+    """First and second letter (0..25) of every position of a padded code
+    matrix, the mask of positions that start an uppercase digraph inside
+    the row, and the digraph count per row.
+
+    ``codes`` holds code points minus ord('A'), any integer dtype.
+    """
+    n, width = codes.shape
+    codes = codes.astype(np.int64)
+    letter = (codes >= 0) & (codes < 26) & (np.arange(width) < lengths[:, None])
+    pair = letter[:, :-1] & letter[:, 1:]
+    first = np.where(pair, codes[:, :-1], 0)
+    second = np.where(pair, codes[:, 1:], 0)
+    return first, second, pair, pair.sum(axis=1)
+
+def digraph_mean(table, first, second, pair, count):
+    """Per-row mean of ``table[first, second]`` over the digraph positions (0 if none)."""
+    total = np.where(pair, table[first, second], 0.0).sum(axis=1)
+    return np.divide(total, count, out=np.zeros(len(count)), where=count > 0)
+
+def digraph_features_batch(codes, lengths, logdi, sdd):
+    """Unscaled (LDI, SDD, RDI) for every row of a padded code matrix.
+
+    Rows without an uppercase digraph get 0, and RDI is 0 for odd lengths.
+    """
+    first, second, pair, count = digraph_pairs(codes, lengths)
+    ldi = digraph_mean(logdi, first, second, pair, count)
+    sdd_value = digraph_mean(sdd, first, second, pair, count)
+    rdi = np.where(lengths % 2 == 0, digraph_mean(logdi, second, first, pair, count), 0.0)
+    return ldi, sdd_value, rdi
+
+def digraph_features_text(text, logdi, sdd):
+    """``digraph_features_batch`` for a single string."""
+    codes = letter_codes(text)
+    letter = (codes >= 0) & (codes < 26)
+    pair = letter[:-1] & letter[1:]
+    if not pair.any():
+        return 0.0, 0.0, 0.0
+    first, second = codes[:-1][pair], codes[1:][pair]
+    rdi = logdi[second, first].mean() if len(codes) % 2 == 0 else 0.0
+    return logdi[first, second].mean(), sdd[first, second].mean(), rdi
+
+if __name__ == "__main__":
+    import argparse
+    from streaming import iter_csv_chunks, DEFAULT_CHUNKSIZE
+
+    parser = argparse.ArgumentParser(description="Build the LDI/SDD digraph tables from the plaintext sentence corpus")
+    parser.add_argument("--input", default=r"F:\minor_project2\dataset\final_dataset.csv")
+    parser.add_argument("--column", default="sentence", help="column holding the plaintext sentences")
+    parser.add_argument("--output", default=DEFAULT_TABLES_PATH)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args()
+
+    counts = np.zeros((26, 26), dtype=np.int64)
+    for chunk in iter_csv_chunks(args.input, args.chunksize, usecols=[args.column]):
+        counts += digraph_counts(chunk[args.column].dropna().astype(str))
+    save_tables(*tables_from_counts(counts), path=args.output)
+    print(f"Digraph tables from {counts.sum()} digraphs saved to {args.output}")
@@ -1,56 +1,96 @@
-import os
-import pandas as pd
-import random
-import base64
-
-from Crypto.Cipher import AES, ARC4
-from Crypto.Random import get_random_bytes
-from Crypto.Util.Padding import pad  # ✅ Use correct pad function
-
-# 📌 Caesar Cipher Function
-def caesar_encrypt(text, shift=3):
-    result = ''
-    for char in text:
-        if char.isalpha():
-            shift_base = ord('A') if char.isupper() else ord('a')
-            result += chr((ord(char) - shift_base + shift) % 26 + shift_base)
-        else:
-            result += char
-    return result
-
-# 📌 AES Encryption with Correct Padding
-def aes_encrypt(text, key):
-    cipher = AES.new(key, AES.MODE_ECB)
-    padded_text = pad(text.encode('utf-8'), AES.block_size)  # ✅ Correct use
-    encrypted = cipher.encrypt(padded_text)
-    return base64.b64encode(encrypted).decode('utf-8')
-
-# 📌 RC4 Encryption
-def rc4_encrypt(text, key):
-    cipher = ARC4.new(key)
-    encrypted = cipher.encrypt(text.encode('utf-8'))
-    return base64.b64encode(encrypted).decode('utf-8')
-
-# 📥 Load Dataset (.csv)
-df_raw = pd.read_csv(r"F:\minor_project2\dataset\final_dataset.csv")  # ✅ Make sure this path is correct
-sentences = df_raw["sentence"].dropna().astype(str).tolist()
-
-# ✨ Generate Labeled Encrypted Records
-records = []
-
-for sentence in sentences:
-    sentence = sentence[:100]  # 🔒 Truncate long sentences
-
-    key16 = get_random_bytes(16)
-    key_rc4 = get_random_bytes(16)
-
-    records.append((sentence, "Plaintext"))
-    records.append((caesar_encrypt(sentence), "Caesar"))
-    records.append((aes_encrypt(sentence, key16), "AES"))
-    records.append((rc4_encrypt(sentence, key_rc4), "RC4"))
-
-# 📤 Save Final Dataset
-df = pd.DataFrame(records, columns=["text", "label"])
-df.to_csv("encryption_dataset_404k.csv", index=False)
-
-print(" Dataset generated and saved as 'encryption_dataset_404k.csv'")
+import os
+import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from ciphers import (  # caesar/aes/rc4_encrypt stay importable from here
+    CIPHERS, DEFAULT_CIPHERS, ENCODINGS, caesar_encrypt, aes_encrypt, rc4_encrypt,
+    check_cipher_names, encrypt_group, plan_groups, interleave,
+)
+from streaming import iter_csv_chunks, append_csv, DEFAULT_CHUNKSIZE
+
+# ✨ Generate Labeled Encrypted Records for one batch of sentences
+def encrypt_batch(sentences, seed=None, batch_index=0, ciphers=DEFAULT_CIPHERS, encoding="base64"):
+    sentences = [sentence[:100] for sentence in sentences]  # 🔒 Truncate long sentences
+    results = encrypt_group(sentences, ciphers, encoding, seed, batch_index)
+    return interleave(len(sentences), ciphers, results)
+
+def encrypt_sentences(chunk, seed=None, batch_index=0, ciphers=DEFAULT_CIPHERS, encoding="base64"):
+    sentences = chunk["sentence"].dropna().astype(str).tolist()
+    return pd.DataFrame(encrypt_batch(sentences, seed, batch_index, ciphers, encoding), columns=["text", "label"])
+
+def generate_dataset(input_csv, output_csv, chunksize=DEFAULT_CHUNKSIZE, workers=None, seed=None, passes=1,
+                     ciphers=DEFAULT_CIPHERS, encoding="base64"):
+    """Encrypt every sentence of ``input_csv`` ``passes`` times into ``output_csv``.
+
+    Each chunk is split into cost-balanced cipher groups (see
+    ``ciphers.plan_groups``), so expensive ciphers get a task to themselves
+    and cheap ones share one. The groups run in a process pool and each
+    chunk is written, in input order and interleaved sentence by sentence,
+    once all its groups finish. Only a few chunks per worker are in flight.
+    Each pass uses fresh keys, so several passes give a larger corpus from
+    the same sentences. Returns the number of rows written.
+    """
+    workers = workers or os.cpu_count() or 1
+    groups = plan_groups(ciphers)
+    tmp_path = output_csv + ".tmp"
+    rows = 0
+    first = True
+    pending = deque()
+
+    def write_oldest():
+        nonlocal rows, first
+        count, futures = pending.popleft()
+        results = {}
+        for future in futures:
+            results.update(future.result())
+        df = pd.DataFrame(interleave(count, ciphers, results), columns=["text", "label"])
+        append_csv(df, tmp_path, first)
+        rows += len(df)
+        first = False
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        batch_index = 0
+        for _ in range(passes):
+            for chunk in iter_csv_chunks(input_csv, chunksize, usecols=["sentence"]):
+                sentences = [s[:100] for s in chunk["sentence"].dropna().astype(str)]  # 🔒 Truncate long sentences
+                futures = [
+                    pool.submit(encrypt_group, sentences, group, encoding, seed, batch_index)
+                    for group in groups
+                ]
+                pending.append((len(sentences), futures))
+                batch_index += 1
+                if len(pending) >= 2 * workers:
+                    write_oldest()
+        while pending:
+            write_oldest()
+
+    if first:
+        open(tmp_path, "w").close()
+    os.replace(tmp_path, output_csv)
+    return rows
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate the labelled encryption dataset")
+    parser.add_argument("--input", default=r"F:\minor_project2\dataset\final_dataset.csv")  # ✅ Make sure this path is correct
+    parser.add_argument("--output", default="encryption_dataset_404k.csv")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="sentences per batch")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=None, help="derive all keys from this seed for a reproducible corpus")
+    parser.add_argument("--passes", type=int, default=1, help="encrypt the corpus this many times with fresh keys")
+    parser.add_argument("--ciphers", nargs="+", default=DEFAULT_CIPHERS, choices=list(CIPHERS), metavar="NAME",
+                        help=f"labels to generate (default: {' '.join(DEFAULT_CIPHERS)}; available: {', '.join(CIPHERS)})")
+    parser.add_argument("--encoding", choices=sorted(ENCODINGS), default="base64", help="text form of binary ciphertexts")
+    args = parser.parse_args()
+    try:
+        check_cipher_names(args.ciphers)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # 📥 Stream the sentences through the ciphers 📤 straight into the output
+    rows = generate_dataset(args.input, args.output, args.chunksize, args.workers, args.seed, args.passes,
+                            args.ciphers, args.encoding)
+
+    print(f" Dataset generated and saved as '{args.output}' ({rows} rows)")
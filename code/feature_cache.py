@@ -0,0 +1,149 @@
+import hashlib
+import sqlite3
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+from batch_features import extract_features_batch
+from feature_schema import FEATURE_SCHEMA_VERSION, current_tables_hash, uses_digraph_tables
+
+# -----------------------------------------
+# 🗃️ Content-hash feature cache
+# -----------------------------------------
+# Repeated ciphertexts (the same AES blocks, the same short RC4 tokens) are
+# extracted once. Entries are keyed by a hash of the schema version, the
+# digraph tables' hash (for rows with LDI/SDD/RDI) and the text, so bumping
+# FEATURE_SCHEMA_VERSION or rebuilding digraph_tables.npy invalidates every
+# old entry.
+# Memory tier: LRU of feature vectors. Optional disk tier: a sqlite file
+# shared across runs.
+
+DEFAULT_CACHE_SIZE = 100_000
+
+class FeatureCache:
+    def __init__(self, max_items=DEFAULT_CACHE_SIZE, db_path=None, schema_version=FEATURE_SCHEMA_VERSION,
+                 tables_hash=None):
+        self.max_items = max_items
+        self.schema_version = schema_version
+        self.tables_hash = tables_hash  # looked up on the first row with LDI/SDD/RDI
+        self._prefixes = {}
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS features (key BLOB PRIMARY KEY, row BLOB)")
+
+    def key(self, text, columns=None):
+        # Rows holding only some columns are keyed by that column list as well
+        columns = None if columns is None else tuple(columns)
+        prefix = self._prefixes.get(columns)
+        if prefix is None:
+            prefix = self._prefixes[columns] = self._prefix(columns)
+        data = f"{prefix}\0{text}".encode("utf-8", "surrogatepass")
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def _prefix(self, columns):
+        version = str(self.schema_version)
+        if columns is None or uses_digraph_tables(columns):
+            self.tables_hash = self.tables_hash or current_tables_hash()
+            version += f"/{self.tables_hash}"
+        return version if columns is None else f"{version}\0{','.join(columns)}"
+
+    def _remember(self, key, row):
+        self._memory[key] = row
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys):
+        """Cached rows for ``keys`` (None where missing); updates the counters."""
+        rows = []
+        missing = []
+        for i, key in enumerate(keys):
+            row = self._memory.get(key)
+            if row is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+            else:
+                missing.append(i)
+            rows.append(row)
+
+        if self._db is not None and missing:
+            found = {}
+            for start in range(0, len(missing), 500):  # stay under sqlite's variable limit
+                batch = [keys[i] for i in missing[start:start + 500]]
+                query = f"SELECT key, row FROM features WHERE key IN ({','.join('?' * len(batch))})"
+                found.update(self._db.execute(query, batch).fetchall())
+            still_missing = []
+            for i in missing:
+                blob = found.get(keys[i])
+                if blob is None:
+                    still_missing.append(i)
+                    continue
+                rows[i] = np.frombuffer(blob, dtype=np.float64)
+                self._remember(keys[i], rows[i])
+                self.disk_hits += 1
+            missing = still_missing
+
+        self.misses += len(missing)
+        return rows
+
+    def put_many(self, keys, rows):
+        for key, row in zip(keys, rows):
+            self._remember(key, row)
+        if self._db is not None:
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO features VALUES (?, ?)",
+                    [(key, row.tobytes()) for key, row in zip(keys, rows)],
+                )
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_items": len(self._memory),
+        }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+@lru_cache(maxsize=None)
+def _feature_dtypes(columns):
+    return extract_features_batch(["AB"], columns=columns).dtypes
+
+def extract_features_cached(texts, cache, batch_size=None, columns=None):
+    """``extract_features_batch`` that only computes texts missing from ``cache``."""
+    import pandas as pd
+
+    texts = [str(t) for t in texts]
+    if columns is not None:
+        columns = tuple(columns)
+    keys = [cache.key(t, columns) for t in texts]
+    rows = cache.get_many(keys)
+
+    # Compute each distinct missing text once
+    todo = {}
+    for i, row in enumerate(rows):
+        if row is None:
+            todo.setdefault(keys[i], texts[i])
+    if todo:
+        kwargs = {"batch_size": batch_size} if batch_size else {}
+        fresh = extract_features_batch(list(todo.values()), columns=columns, **kwargs)
+        computed = {key: row.copy() for key, row in zip(todo, fresh.to_numpy(dtype=np.float64))}
+        cache.put_many(list(computed), list(computed.values()))
+        rows = [computed[k] if row is None else row for k, row in zip(keys, rows)]
+
+    dtypes = _feature_dtypes(columns)
+    columns = list(dtypes.index)
+    frame = pd.DataFrame(np.vstack(rows) if rows else np.zeros((0, len(columns))), columns=columns)
+    return frame.astype(dtypes)
@@ -0,0 +1,112 @@
+import argparse
+import time
+
+import pandas as pd
+
+from batch_features import DEFAULT_BATCH_SIZE, GROUP_EXTRACTORS, Chunk
+from feature_schema import FEATURE_GROUPS, groups_for, normalize_text
+
+# -----------------------------------------
+# ⏱️ Per-group extraction cost (and importance, given a model)
+# -----------------------------------------
+# standalone: time to compute the group on its own, including the encoding
+#             and the histogram / first positions it needs
+# marginal:   time on top of those shared intermediates, i.e. what dropping
+#             the group saves when other histogram groups stay
+# Together with a model's importances this shows which groups are worth
+# their time.
+
+SHARED_STEPS = {
+    "encode": lambda texts: Chunk(texts),
+    "histogram": lambda texts: Chunk(texts).counts,
+    "positions": lambda texts: Chunk(texts).positions,
+}
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def profile_groups(texts, batch_size=DEFAULT_BATCH_SIZE, groups=None):
+    """Seconds per group over ``texts``; DataFrame indexed by group name."""
+    texts = [normalize_text(t) for t in texts]
+    groups = list(FEATURE_GROUPS) if groups is None else groups
+    standalone = dict.fromkeys(groups, 0.0)
+    marginal = dict.fromkeys(groups, 0.0)
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        warm = Chunk(batch)
+        warm.counts, warm.positions  # shared intermediates, already paid for
+        for group in groups:
+            extract = GROUP_EXTRACTORS[group]
+            standalone[group] += _timed(lambda: extract(Chunk(batch)))
+            marginal[group] += _timed(lambda: extract(warm))
+
+    report = pd.DataFrame({
+        "columns": [len(FEATURE_GROUPS[g]) for g in groups],
+        "standalone_s": [standalone[g] for g in groups],
+        "marginal_s": [marginal[g] for g in groups],
+    }, index=pd.Index(groups, name="group"))
+    for name in ("standalone", "marginal"):
+        report[f"{name}_us_per_text"] = 1e6 * report[f"{name}_s"] / max(len(texts), 1)
+    return report
+
+def profile_shared(texts, batch_size=DEFAULT_BATCH_SIZE):
+    """Seconds spent on the shared steps (each includes the encoding)."""
+    texts = [normalize_text(t) for t in texts]
+    return {
+        name: sum(_timed(lambda: step(texts[s:s + batch_size])) for s in range(0, len(texts), batch_size))
+        for name, step in SHARED_STEPS.items()
+    }
+
+def group_importance(clf):
+    """Sum of ``clf.feature_importances_`` per group (groups the model does not use get 0)."""
+    columns = list(getattr(clf, "feature_names_in_", []))
+    importances = getattr(clf, "feature_importances_", None)
+    if importances is None or not columns:
+        return None
+    by_column = dict(zip(columns, importances))
+    return pd.Series({g: sum(by_column.get(c, 0.0) for c in cols) for g, cols in FEATURE_GROUPS.items()})
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the extraction cost of every feature group")
+    parser.add_argument("--input", required=True, help="dataset CSV with a 'text' (or 'ciphertext') column")
+    parser.add_argument("--rows", type=int, default=20_000, help="rows to profile")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--model", help="model artifact or fitted model (joblib); "
+                        "adds per-group importance and what it needs")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.input, nrows=args.rows)
+    texts = (df["text"] if "text" in df.columns else df["ciphertext"]).tolist()
+
+    report = profile_groups(texts, args.batch_size)
+    if args.model:
+        import joblib
+        from model_artifact import check_artifact, is_artifact
+
+        clf = joblib.load(args.model)
+        if is_artifact(clf):  # train.py output; a bare estimator is used as is
+            clf = check_artifact(clf, args.model)["model"]
+        importance = group_importance(clf)
+        if importance is not None:
+            report["importance"] = importance
+        needed = set(groups_for(getattr(clf, "feature_names_in_", [])))
+        report["used"] = [g in needed for g in report.index]
+
+    shared = profile_shared(texts, args.batch_size)
+    n = max(len(texts), 1)
+    print(f"{len(texts)} texts, batch size {args.batch_size}")
+    print("shared steps (us/text): " + ", ".join(f"{k} {1e6 * v / n:.1f}" for k, v in shared.items()))
+    columns = ["columns", "standalone_us_per_text", "marginal_us_per_text"]
+    columns += [c for c in ("importance", "used") if c in report.columns]
+    with pd.option_context("display.float_format", "{:.2f}".format, "display.width", 120):
+        print(report[columns].sort_values("marginal_us_per_text", ascending=False).to_string())
+    if "used" in report.columns:
+        used = report[report["used"]]
+        print(f"model needs {len(used)}/{len(report)} groups: "
+              f"{used['marginal_us_per_text'].sum():.1f} of {report['marginal_us_per_text'].sum():.1f} "
+              "marginal us/text")
+
+if __name__ == "__main__":
+    main()
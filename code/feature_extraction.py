@@ -1,217 +1,251 @@
-import pandas as pd
-import numpy as np
-import os
-import math
-import string
-from collections import Counter
-
-# -----------------------------------------
-# 🧩 Feature extraction dependencies
-# -----------------------------------------
-
-CHAR_POOL = string.ascii_letters + string.digits + string.punctuation
-
-rel_freq = {
-    'A': 0.08167, 'B': 0.01492, 'C': 0.02782, 'D': 0.04253, 'E': 0.12702,
-    'F': 0.02228, 'G': 0.02015, 'H': 0.06094, 'I': 0.06966, 'J': 0.00153,
-    'K': 0.00772, 'L': 0.04025, 'M': 0.02406, 'N': 0.06749, 'O': 0.07507,
-    'P': 0.01929, 'Q': 0.00095, 'R': 0.05987, 'S': 0.06327, 'T': 0.09056,
-    'U': 0.07258, 'V': 0.00978, 'W': 0.02360, 'X': 0.00150, 'Y': 0.01974, 'Z': 0.00074
-}
-
-logdi = np.zeros((26, 26))  # Replace with real values if available
-sdd = np.zeros((26, 26))    # Replace with real values if available
-
-english_freq_list = np.array([4, 19, 0, 14, 8, 13, 18, 17, 7, 11, 3, 20,
-                               2, 12, 6, 5, 24, 15, 22, 1, 21, 10, 23, 9, 25, 16]) + 1
-LETTERS = list(string.ascii_uppercase)
-
-# -----------------------------------------
-# 📊 Feature functions
-# -----------------------------------------
-
-def calculate_entropy(text):
-    if not text:
-        return 0
-    prob = [text.count(c) / len(text) for c in set(text)]
-    return -sum(p * math.log2(p) for p in prob)
-
-def ascii_stats(text):
-    values = [ord(c) for c in text]
-    if not values:
-        return {"ascii_mean": 0, "ascii_std": 0, "ascii_min": 0, "ascii_max": 0}
-    return {
-        "ascii_mean": np.mean(values),
-        "ascii_std": np.std(values),
-        "ascii_min": np.min(values),
-        "ascii_max": np.max(values),
-    }
-
-def char_type_ratios(text):
-    total = len(text) if text else 1
-    return {
-        "digit_ratio": sum(c.isdigit() for c in text) / total,
-        "alpha_ratio": sum(c.isalpha() for c in text) / total,
-        "symbol_ratio": sum(not c.isalnum() for c in text) / total,
-    }
-
-def base64_specifics(text):
-    return {
-        "equals_count": text.count('='),
-        "plus_count": text.count('+'),
-        "slash_count": text.count('/'),
-        "equals_ratio": text.count('=') / len(text) if len(text) > 0 else 0,
-    }
-
-def num_unique_chars(text):
-    return len(set(text))
-
-def get_ic(text):
-    freqs = Counter(text)
-    L = len(text)
-    return sum(f * (f - 1) for f in freqs.values()) / (L * (L - 1)) if L > 1 else 0
-
-def gather_letters(text, start, period):
-    return ''.join(text[i] for i in range(start, len(text), period))
-
-def get_mic(text):
-    return max(
-        np.mean([get_ic(gather_letters(text, s, p)) for s in range(p)])
-        for p in range(1, min(16, len(text)))
-    )
-
-def get_mka(text):
-    return max(
-        sum(text[i] == text[i + p] for i in range(len(text) - p)) / (len(text) - p)
-        if len(text) > p else 0
-        for p in range(1, 16)
-    )
-
-def get_dic(text):
-    bigrams = [text[i:i+2] for i in range(len(text) - 1)]
-    freq = Counter(bigrams)
-    total = len(bigrams)
-    return sum(f * (f - 1) for f in freq.values()) / (total * (total - 1)) if total > 1 else 0
-
-def get_edi(text):
-    if len(text) <= 2:
-        return 0
-    bigrams = [text[i:i+2] for i in range(0, len(text) - 1, 2)]
-    freq = Counter(bigrams)
-    denominator = len(text) * (len(text) - 2)
-    if denominator == 0:
-        return 0
-    return 4 * sum(f * (f - 1) for f in freq.values()) / denominator
-
-
-def get_lr(text):
-    trigrams = [text[i:i+3] for i in range(len(text) - 2)]
-    freq = Counter(trigrams)
-    return 1000 * math.sqrt(sum(f - 1 for f in freq.values())) / len(text)
-
-def get_ldi(text):
-    indices = [
-        (ord(text[i]) - 65, ord(text[i + 1]) - 65)
-        for i in range(len(text) - 1)
-        if 'A' <= text[i] <= 'Z' and 'A' <= text[i + 1] <= 'Z'
-    ]
-    return 100 * np.mean([logdi[a][b] for a, b in indices]) if indices else 0
-
-def get_sdd(text):
-    indices = [
-        (ord(text[i]) - 65, ord(text[i + 1]) - 65)
-        for i in range(len(text) - 1)
-        if 'A' <= text[i] <= 'Z' and 'A' <= text[i + 1] <= 'Z'
-    ]
-    return 100 * np.mean([sdd[a][b] for a, b in indices]) if indices else 0
-
-def get_rdi(text):
-    if len(text) < 2 or len(text) % 2 != 0:
-        return 0
-    indices = [
-        (ord(text[i + 1]) - 65, ord(text[i]) - 65)
-        for i in range(len(text) - 1)
-        if 'A' <= text[i] <= 'Z' and 'A' <= text[i + 1] <= 'Z'
-    ]
-    return 100 * np.mean([logdi[a][b] for a, b in indices]) if indices else 0
-
-
-def get_nomor(text):
-    letter_counts = Counter(text)
-    freq_array = np.zeros(26)
-    for letter, count in letter_counts.items():
-        if letter.upper() in rel_freq:
-            freq_array[ord(letter.upper()) - 65] = count
-    freq_order = np.argsort(-freq_array) + 1
-    return sum(abs(english_freq_list[:20] - freq_order[:20]))
-
-def chi_square_stat(text):
-    N = len(text)
-    if N == 0:
-        return 0
-    freq = Counter(text)
-    chi_sq = 0
-    for c in rel_freq:
-        observed = freq.get(c, 0)
-        expected = rel_freq[c] * N
-        if expected > 0:
-            chi_sq += (observed - expected) ** 2 / expected
-    return chi_sq
-
-# -----------------------------------------
-# 🧠 Master Feature Extractor
-# -----------------------------------------
-def extract_features(text):
-    counter = Counter(text)
-    features = {}
-
-    # Character frequency
-    for ch in CHAR_POOL:
-        features[f'freq_{ch}'] = counter.get(ch, 0) / len(text) if text else 0
-
-    features['length'] = len(text)
-    features['unique_chars'] = num_unique_chars(text)
-    features['entropy'] = calculate_entropy(text)
-
-    features.update(ascii_stats(text))
-    features.update(char_type_ratios(text))
-    features.update(base64_specifics(text))
-
-    # Cipher-specific statistical features
-    features['IC'] = 1000 * get_ic(text)
-    features['MIC'] = 1000 * get_mic(text)
-    features['MKA'] = 1000 * get_mka(text)
-    features['DIC'] = 10000 * get_dic(text)
-    features['EDI'] = get_edi(text)
-    features['LR'] = get_lr(text)
-    features['LDI'] = get_ldi(text)
-    features['SDD'] = get_sdd(text)
-    features['NOMOR'] = get_nomor(text)
-    features['RDI'] = get_rdi(text)
-    features['ChiSquare'] = chi_square_stat(text)
-
-    return features
-
-# -----------------------------------------
-# 📂 Load dataset and apply feature extraction
-# -----------------------------------------
-input_csv_path = os.path.join("dataset", r"F:\minor_project2\dataset\encryption_dataset_404k.csv")         # <- Your input dataset
-output_csv_path = os.path.join("dataset", r"F:\minor_project2\dataset\encrypted_features.csv")       # <- Output with features
-
-# Load dataset
-df = pd.read_csv(input_csv_path)
-if 'text' in df.columns:
-    df['ciphertext'] = df['text']
-
-# Extract features row-wise
-feature_rows = []
-for _, row in df.iterrows():
-    feats = extract_features(str(row['ciphertext']).upper())  # convert to uppercase for consistency
-    feats['label'] = row['label']  # Keep original label
-    feature_rows.append(feats)
-
-# Save result
-feature_df = pd.DataFrame(feature_rows)
-feature_df.to_csv(output_csv_path, index=False)
-
-print(f"Feature extraction complete. Saved to: {output_csv_path}")
\ No newline at end of file
+import numpy as np
+import os
+import math
+import string
+from collections import Counter
+
+from periodic import (
+    DEFAULT_MAX_PERIOD, encode_text, periodic_counts, lag_coincidences,
+    mic_from_counts, mka_from_coincidences,
+)
+from ngrams import ngram_counts, dic_from_counts, edi_from_counts, lr_from_counts
+from digraph_tables import default_tables, digraph_features_text
+from feature_schema import CHAR_POOL  # column order: see feature_schema.py
+
+# -----------------------------------------
+# 🧩 Feature extraction dependencies
+# -----------------------------------------
+
+rel_freq = {
+    'A': 0.08167, 'B': 0.01492, 'C': 0.02782, 'D': 0.04253, 'E': 0.12702,
+    'F': 0.02228, 'G': 0.02015, 'H': 0.06094, 'I': 0.06966, 'J': 0.00153,
+    'K': 0.00772, 'L': 0.04025, 'M': 0.02406, 'N': 0.06749, 'O': 0.07507,
+    'P': 0.01929, 'Q': 0.00095, 'R': 0.05987, 'S': 0.06327, 'T': 0.09056,
+    'U': 0.07258, 'V': 0.00978, 'W': 0.02360, 'X': 0.00150, 'Y': 0.01974, 'Z': 0.00074
+}
+
+english_freq_list = np.array([4, 19, 0, 14, 8, 13, 18, 17, 7, 11, 3, 20,
+                               2, 12, 6, 5, 24, 15, 22, 1, 21, 10, 23, 9, 25, 16]) + 1
+LETTERS = list(string.ascii_uppercase)
+
+# -----------------------------------------
+# 📊 Feature functions
+# -----------------------------------------
+
+def calculate_entropy(text):
+    if not text:
+        return 0
+    prob = [text.count(c) / len(text) for c in set(text)]
+    return -sum(p * math.log2(p) for p in prob)
+
+def ascii_stats(text):
+    values = [ord(c) for c in text]
+    if not values:
+        return {"ascii_mean": 0, "ascii_std": 0, "ascii_min": 0, "ascii_max": 0}
+    return {
+        "ascii_mean": np.mean(values),
+        "ascii_std": np.std(values),
+        "ascii_min": np.min(values),
+        "ascii_max": np.max(values),
+    }
+
+def char_type_ratios(text):
+    total = len(text) if text else 1
+    return {
+        "digit_ratio": sum(c.isdigit() for c in text) / total,
+        "alpha_ratio": sum(c.isalpha() for c in text) / total,
+        "symbol_ratio": sum(not c.isalnum() for c in text) / total,
+    }
+
+def base64_specifics(text):
+    return {
+        "equals_count": text.count('='),
+        "plus_count": text.count('+'),
+        "slash_count": text.count('/'),
+        "equals_ratio": text.count('=') / len(text) if len(text) > 0 else 0,
+    }
+
+def num_unique_chars(text):
+    return len(set(text))
+
+def get_ic(text):
+    freqs = Counter(text)
+    L = len(text)
+    return sum(f * (f - 1) for f in freqs.values()) / (L * (L - 1)) if L > 1 else 0
+
+def gather_letters(text, start, period):
+    return ''.join(text[i] for i in range(start, len(text), period))
+
+def get_mic(text, max_period=DEFAULT_MAX_PERIOD):
+    codes, n_symbols = encode_text(text)
+    return mic_from_counts(periodic_counts(codes, n_symbols, max_period), len(text))
+
+def get_mka(text, max_period=DEFAULT_MAX_PERIOD):
+    codes, _ = encode_text(text)
+    return mka_from_coincidences(lag_coincidences(codes, max_period), len(text))
+
+def get_dic(text):
+    codes, n_symbols = encode_text(text)
+    return dic_from_counts(ngram_counts(codes, n_symbols, 2), len(codes))
+
+def get_edi(text):
+    codes, n_symbols = encode_text(text)
+    return edi_from_counts(ngram_counts(codes, n_symbols, 2, step=2), len(codes))
+
+def get_lr(text):
+    codes, n_symbols = encode_text(text)
+    return lr_from_counts(ngram_counts(codes, n_symbols, 3), len(codes))
+
+def get_ldi(text):
+    return 100 * digraph_features_text(text, *default_tables())[0]
+
+def get_sdd(text):
+    return 100 * digraph_features_text(text, *default_tables())[1]
+
+def get_rdi(text):
+    return 100 * digraph_features_text(text, *default_tables())[2]
+
+def nomor_from_counter(counter):
+    # Walks the Counter in order: the later case of a letter overwrites the earlier
+    freq_array = np.zeros(26)
+    for letter, count in counter.items():
+        if letter.upper() in rel_freq:
+            freq_array[ord(letter.upper()) - 65] = count
+    freq_order = np.argsort(-freq_array) + 1
+    return sum(abs(english_freq_list[:20] - freq_order[:20]))
+
+def get_nomor(text):
+    return nomor_from_counter(Counter(text))
+
+def chi_square_stat(text):
+    N = len(text)
+    if N == 0:
+        return 0
+    freq = Counter(text)
+    chi_sq = 0
+    for c in rel_freq:
+        observed = freq.get(c, 0)
+        expected = rel_freq[c] * N
+        if expected > 0:
+            chi_sq += (observed - expected) ** 2 / expected
+    return chi_sq
+
+# -----------------------------------------
+# 🧠 Master Feature Extractor
+# -----------------------------------------
+
+# Helpers extract_features calls (benchmarked and profiled by name)
+FEATURE_FUNCTIONS = (
+    "calculate_entropy", "ascii_stats", "char_type_ratios", "base64_specifics", "num_unique_chars",
+    "get_ic", "get_mic", "get_mka", "get_dic", "get_edi", "get_lr", "get_ldi", "get_sdd",
+    "get_nomor", "get_rdi", "chi_square_stat",
+)
+
+def extract_features(text):
+    counter = Counter(text)
+    features = {}
+
+    # Character frequency
+    for ch in CHAR_POOL:
+        features[f'freq_{ch}'] = counter.get(ch, 0) / len(text) if text else 0
+
+    features['length'] = len(text)
+    features['unique_chars'] = num_unique_chars(text)
+    features['entropy'] = calculate_entropy(text)
+
+    features.update(ascii_stats(text))
+    features.update(char_type_ratios(text))
+    features.update(base64_specifics(text))
+
+    # Cipher-specific statistical features
+    features['IC'] = 1000 * get_ic(text)
+    features['MIC'] = 1000 * get_mic(text)
+    features['MKA'] = 1000 * get_mka(text)
+    features['DIC'] = 10000 * get_dic(text)
+    features['EDI'] = get_edi(text)
+    features['LR'] = get_lr(text)
+    features['LDI'] = get_ldi(text)
+    features['SDD'] = get_sdd(text)
+    features['NOMOR'] = get_nomor(text)
+    features['RDI'] = get_rdi(text)
+    features['ChiSquare'] = chi_square_stat(text)
+
+    return features
+
+# -----------------------------------------
+# 📂 Load dataset and apply feature extraction
+# -----------------------------------------
+if __name__ == "__main__":
+    import argparse
+    from batch_features import extract_features_frame
+    from streaming import stream_transform, DEFAULT_CHUNKSIZE
+
+    parser = argparse.ArgumentParser(description="Extract ciphertext features from a labelled dataset CSV")
+    parser.add_argument("--input", default=os.path.join("dataset", r"F:\minor_project2\dataset\encryption_dataset_404k.csv"))  # <- Your input dataset
+    parser.add_argument("--output", default=os.path.join("dataset", r"F:\minor_project2\dataset\encrypted_features.csv"))  # <- Output with features
+    parser.add_argument("--format", choices=["csv", "store"], default="csv",
+                        help="'store' writes a memory-mappable feature store directory (see feature_store.py) to --output")
+    parser.add_argument("--mode", choices=["text", "bytes"], default="text",
+                        help="'bytes' decodes base64/hex payloads and writes the byte-mode features (byte_features.py)")
+    parser.add_argument("--shards", metavar="DIR", help="split the work into resumable shards under DIR and use every core")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="rows held in memory at once (rows per shard with --shards)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--cache-db", metavar="PATH", help="sqlite feature cache reused across runs")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="in-memory LRU entries for repeated texts (0 = none; with --cache-db, disk only)")
+    parser.add_argument("--profile", metavar="PATH", help="record per-stage and per-feature timings; write them to PATH "
+                        "(Prometheus text if it ends in .prom, '-' for stderr)")
+    args = parser.parse_args()
+
+    if args.mode == "bytes" and (args.shards or args.cache_db or args.cache_size):
+        parser.error("--mode bytes supports neither --shards nor the feature cache")
+
+    if args.profile:
+        if args.shards:
+            parser.error("--profile is not supported with --shards (workers run in other processes)")
+        from profiling import enable
+        enable()
+
+    cache = None
+    if args.cache_db or args.cache_size:
+        if args.shards:
+            parser.error("the feature cache is not supported with --shards")
+        from feature_cache import FeatureCache
+        cache = FeatureCache(args.cache_size, args.cache_db)
+
+    if args.shards:
+        from shard_pipeline import run_sharded, merge_shards
+
+        run_sharded(args.input, args.shards, chunksize=args.chunksize, workers=args.workers)
+        if args.format == "store":
+            from shard_pipeline import merge_shards_to_store
+            merge_shards_to_store(args.shards, args.output)
+        else:
+            merge_shards(args.shards, args.output)
+    else:
+        # Stream the dataset chunk by chunk and append features to the output
+        extract = lambda chunk: extract_features_frame(chunk, cache=cache)
+        if args.mode == "bytes":
+            from byte_features import extract_byte_features_frame as extract
+        if args.format == "store":
+            from feature_store import FeatureStoreWriter
+            from profiling import stage, timed_iter
+            from streaming import iter_csv_chunks
+
+            with FeatureStoreWriter(args.output) as store:
+                for chunk in timed_iter(iter_csv_chunks(args.input, args.chunksize), "load"):
+                    with stage("extract", len(chunk)):
+                        features = extract(chunk)
+                    with stage("write", len(features)):
+                        store.append(features)
+        else:
+            stream_transform(args.input, args.output, extract, chunksize=args.chunksize)
+        if cache is not None:
+            print(f"Feature cache: {cache.stats()}")
+            cache.close()
+
+    if args.profile:
+        from profiling import write_profile
+        write_profile(args.profile)
+
+    print(f"Feature extraction complete. Saved to: {args.output}")
\ No newline at end of file
@@ -0,0 +1,191 @@
+import string
+
+import numpy as np
+
+# -----------------------------------------
+# 📐 Feature schema shared by training and inference
+# -----------------------------------------
+# The one definition of which features exist, in which order, and how a
+# text is normalized before extraction. Training (feature_extraction.py ->
+# feature store -> notebook) and inference (predictor.py, classify.py, the
+# prediction server) both go through feature_matrix(), so a model always
+# sees features computed the way it was trained on. Models are stamped with
+# FEATURE_SCHEMA_VERSION, and the hash of the digraph tables LDI/SDD/RDI
+# were computed with, when saved and checked when loaded.
+
+# Bump whenever a feature's definition, the column order or the text
+# normalization changes; cached features, stores and models from an older
+# version are then rejected instead of silently mixed in.
+FEATURE_SCHEMA_VERSION = 2  # 2: LDI/SDD/RDI from the real digraph tables
+
+CHAR_POOL = string.ascii_letters + string.digits + string.punctuation
+
+# Columns are computed in groups that share work (batch_features.GROUP_EXTRACTORS);
+# a group only runs when one of its columns is requested. Group order is
+# column order.
+FEATURE_GROUPS = {
+    'freq_lower': tuple(f'freq_{ch}' for ch in string.ascii_lowercase),
+    'freq_upper': tuple(f'freq_{ch}' for ch in string.ascii_uppercase),
+    'freq_digit': tuple(f'freq_{ch}' for ch in string.digits),
+    'freq_punct': tuple(f'freq_{ch}' for ch in string.punctuation),
+    'general': ('length', 'unique_chars', 'entropy'),
+    'ascii': ('ascii_mean', 'ascii_std', 'ascii_min', 'ascii_max'),
+    'char_types': ('digit_ratio', 'alpha_ratio', 'symbol_ratio'),
+    'base64': ('equals_count', 'plus_count', 'slash_count', 'equals_ratio'),
+    'IC': ('IC',),
+    'periodic': ('MIC', 'MKA'),
+    'ngram': ('DIC', 'EDI', 'LR'),
+    'LDI': ('LDI',),
+    'SDD': ('SDD',),
+    'NOMOR': ('NOMOR',),
+    'RDI': ('RDI',),
+    'ChiSquare': ('ChiSquare',),
+}
+
+FEATURE_COLUMNS = tuple(column for columns in FEATURE_GROUPS.values() for column in columns)
+COLUMN_GROUP = {column: group for group, columns in FEATURE_GROUPS.items() for column in columns}
+
+# Byte mode (byte_features.py): a separate feature family computed on the
+# raw text, not the normalized one, after decoding base64/hex payloads to
+# bytes. A model uses either text or byte columns, never both.
+BLOCK_SIZES = (8, 16)  # DES/3DES and AES block sizes
+
+BYTE_FEATURE_GROUPS = {
+    'encoding': ('enc_raw', 'enc_hex', 'enc_base64'),
+    'byte_length': ('n_bytes',) + tuple(f'n_bytes_mod_{b}' for b in BLOCK_SIZES),
+    'byte_hist': tuple(f'byte_{i:02x}' for i in range(256)),
+    'byte_entropy': ('byte_entropy',),
+    'block_repeats': tuple(f'block_repeats_{b}' for b in BLOCK_SIZES),
+}
+
+BYTE_FEATURE_COLUMNS = tuple(column for columns in BYTE_FEATURE_GROUPS.values() for column in columns)
+BYTE_COLUMN_GROUP = {column: group for group, columns in BYTE_FEATURE_GROUPS.items() for column in columns}
+
+DIGRAPH_COLUMNS = ('LDI', 'SDD', 'RDI')  # computed from digraph_tables.npy
+
+FEATURE_DTYPE = np.float32
+MODEL_VERSION_ATTR = "feature_schema_version_"
+MODEL_TABLES_ATTR = "digraph_tables_"
+
+class SchemaMismatchError(ValueError):
+    """Features, a feature store or a model come from another schema version."""
+
+def check_schema_version(version, what):
+    if version is None:
+        raise SchemaMismatchError(
+            f"{what} records no feature schema version; retrain it, or stamp it if it is known "
+            f"to match version {FEATURE_SCHEMA_VERSION}"
+        )
+    if version != FEATURE_SCHEMA_VERSION:
+        raise SchemaMismatchError(
+            f"{what} has feature schema version {version}, but this code computes version "
+            f"{FEATURE_SCHEMA_VERSION}; re-extract the features and retrain"
+        )
+
+def uses_digraph_tables(columns):
+    return any(c in DIGRAPH_COLUMNS for c in columns)
+
+def current_tables_hash():
+    """Hash of the digraph tables this process computes LDI/SDD/RDI with."""
+    from digraph_tables import tables_hash
+    return tables_hash()
+
+def check_tables_hash(recorded, columns, what):
+    """Fail if ``columns`` use the digraph tables and ``recorded`` is not the current tables' hash."""
+    if not uses_digraph_tables(columns):
+        return
+    current = current_tables_hash()
+    if recorded != current:
+        raise SchemaMismatchError(
+            f"{what} was computed with digraph tables {recorded or '(not recorded)'}, but this code loads "
+            f"tables {current}; use the same digraph_tables.npy, or re-extract the features and retrain"
+        )
+
+def groups_for(columns):
+    """Names of the groups needed for ``columns``, in schema order."""
+    unknown = [c for c in columns if c not in COLUMN_GROUP]
+    if unknown:
+        raise ValueError(f"unknown feature columns: {', '.join(unknown)}")
+    needed = {COLUMN_GROUP[c] for c in columns}
+    return [group for group in FEATURE_GROUPS if group in needed]
+
+def feature_mode(columns):
+    """'text' or 'bytes': the feature family ``columns`` belong to."""
+    is_byte = [c in BYTE_COLUMN_GROUP for c in columns]
+    if is_byte and all(is_byte):
+        return "bytes"
+    if any(is_byte):
+        raise SchemaMismatchError("columns mix text and byte features")
+    return "text"
+
+# -----------------------------------------
+# 🔢 Texts -> contiguous float32 matrix
+# -----------------------------------------
+
+def normalize_text(text):
+    return str(text).upper()  # the dataset is extracted uppercase
+
+def feature_matrix(texts, batch_size=None, cache=None, columns=None):
+    """Normalize ``texts`` and return their features as a C-contiguous
+    float32 array of shape (len(texts), len(columns)).
+
+    ``columns`` defaults to all of FEATURE_COLUMNS; pass a model's columns
+    to compute only the groups it uses. With a ``feature_cache.FeatureCache``,
+    repeated texts are looked up instead of recomputed. Byte columns are
+    computed from the raw texts by ``byte_features`` (no cache; they are
+    cheaper than a lookup).
+    """
+    from batch_features import DEFAULT_BATCH_SIZE, extract_features_array
+
+    batch_size = batch_size or DEFAULT_BATCH_SIZE
+    columns = list(FEATURE_COLUMNS if columns is None else columns)
+    if feature_mode(columns) == "bytes":
+        from byte_features import byte_feature_matrix
+        return byte_feature_matrix(texts, batch_size, columns, dtype=FEATURE_DTYPE)
+
+    texts = [normalize_text(t) for t in texts]
+    if cache is None:
+        return extract_features_array(texts, batch_size, columns, dtype=FEATURE_DTYPE)
+
+    from feature_cache import extract_features_cached
+
+    out = np.empty((len(texts), len(columns)), dtype=FEATURE_DTYPE)
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        frame = extract_features_cached(batch, cache, batch_size, columns)
+        out[start:start + len(batch)] = frame.to_numpy(dtype=FEATURE_DTYPE)
+    return out
+
+def feature_frame(texts, batch_size=None, cache=None, columns=None):
+    """``feature_matrix`` as a DataFrame (a view, no copy) with named columns."""
+    import pandas as pd
+
+    columns = list(FEATURE_COLUMNS if columns is None else columns)
+    return pd.DataFrame(feature_matrix(texts, batch_size, cache, columns), columns=columns, copy=False)
+
+# -----------------------------------------
+# 🏷️ Model artifacts
+# -----------------------------------------
+
+def stamp_model(clf, schema_version=FEATURE_SCHEMA_VERSION, tables_hash=None):
+    """Record the schema version (and, if its columns use them, the digraph
+    tables' hash) ``clf`` was trained on; saved with it by joblib."""
+    setattr(clf, MODEL_VERSION_ATTR, schema_version)
+    if tables_hash is None and uses_digraph_tables(getattr(clf, "feature_names_in_", FEATURE_COLUMNS)):
+        tables_hash = current_tables_hash()
+    setattr(clf, MODEL_TABLES_ATTR, tables_hash)
+    return clf
+
+def check_model(clf):
+    """Fail fast if ``clf`` was trained on other features than this code computes.
+
+    Returns the columns the model expects, in its training order.
+    """
+    check_schema_version(getattr(clf, MODEL_VERSION_ATTR, None), f"model {type(clf).__name__}")
+    columns = list(getattr(clf, "feature_names_in_", FEATURE_COLUMNS))
+    unknown = [c for c in columns if c not in COLUMN_GROUP and c not in BYTE_COLUMN_GROUP]
+    if unknown:
+        raise SchemaMismatchError(f"model expects features not in the schema: {', '.join(unknown)}")
+    feature_mode(columns)
+    check_tables_hash(getattr(clf, MODEL_TABLES_ATTR, None), columns, f"model {type(clf).__name__}")
+    return columns
@@ -0,0 +1,155 @@
+import json
+import os
+
+import numpy as np
+
+from feature_schema import (
+    FEATURE_SCHEMA_VERSION, check_schema_version, check_tables_hash, current_tables_hash, uses_digraph_tables,
+)
+
+# -----------------------------------------
+# 🧱 Columnar feature store (.npy + schema sidecar)
+# -----------------------------------------
+# A store is a directory:
+#   features.npy  float32 (rows, columns) matrix
+#   labels.npy    uint16 label codes
+#   schema.json   column names, classes (code -> label), row count, version,
+#                 hash of the digraph tables (when LDI/SDD/RDI are stored)
+# Both arrays are plain .npy files, so np.load(mmap_mode='r') maps them
+# without parsing or copying. Rows are appended chunk by chunk; the .npy
+# header is reserved up front and rewritten with the final shape on close.
+
+FEATURES_FILE = "features.npy"
+LABELS_FILE = "labels.npy"
+SCHEMA_FILE = "schema.json"
+HEADER_SIZE = 128  # bytes reserved for the .npy header (multiple of 64)
+
+def _npy_header(dtype, shape):
+    header = repr({"descr": np.dtype(dtype).str, "fortran_order": False, "shape": shape})
+    # magic (6) + version (2) + header length (2) + header + padding + newline
+    pad = HEADER_SIZE - 10 - len(header) - 1
+    if pad < 0:
+        raise ValueError(f"shape {shape} does not fit the reserved .npy header")
+    header = (header + " " * pad + "\n").encode("latin-1")
+    return b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header
+
+class _NpyAppender:
+    def __init__(self, path, dtype, width=None):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.width = width
+        self.rows = 0
+        self._file = open(path, "wb")
+        self._file.write(_npy_header(self.dtype, self._shape()))
+
+    def _shape(self):
+        return (self.rows,) if self.width is None else (self.rows, self.width)
+
+    def append(self, array):
+        array = np.ascontiguousarray(array, dtype=self.dtype)
+        self._file.write(array.tobytes())
+        self.rows += len(array)
+
+    def close(self):
+        self._file.seek(0)
+        self._file.write(_npy_header(self.dtype, self._shape()))
+        self._file.close()
+
+class FeatureStoreWriter:
+    """Append feature DataFrames (with a ``label`` column) or plain arrays to a store directory.
+
+    ``classes`` fixes the first label codes (e.g. to keep a source store's
+    order); labels not in it are coded in order of appearance.
+    """
+
+    def __init__(self, path, dtype=np.float32, classes=()):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.columns = None
+        self.classes = []
+        self._codes = {}
+        self._features = None
+        for label in classes:
+            self._code(label)
+        os.makedirs(path, exist_ok=True)
+        self._labels = _NpyAppender(os.path.join(path, LABELS_FILE), np.uint16)
+
+    def _code(self, label):
+        if label not in self._codes:
+            self._codes[label] = len(self.classes)
+            self.classes.append(label)
+        return self._codes[label]
+
+    def append(self, feature_df):
+        columns = [c for c in feature_df.columns if c != "label"]
+        self.append_array(feature_df[columns].to_numpy(dtype=self.dtype), feature_df["label"].to_numpy(), columns)
+
+    def append_array(self, features, labels, columns):
+        """Append a (rows, len(columns)) matrix and its label values."""
+        if self.columns is None:
+            self.columns = list(columns)
+            self._features = _NpyAppender(os.path.join(self.path, FEATURES_FILE), self.dtype, len(columns))
+        elif list(columns) != self.columns:
+            raise ValueError("feature columns differ from the ones already in the store")
+
+        self._features.append(features)
+        values, first, inverse = np.unique(np.asarray(labels), return_index=True, return_inverse=True)
+        codes = np.zeros(len(values), dtype=np.uint16)
+        for i in np.argsort(first):
+            codes[i] = self._code(values[i])
+        self._labels.append(codes[inverse.reshape(-1)])
+
+    def close(self):
+        if self._features is None:
+            raise ValueError("no rows were written to the feature store")
+        self._features.close()
+        self._labels.close()
+        schema = {
+            "schema_version": FEATURE_SCHEMA_VERSION,
+            "columns": self.columns,
+            "dtype": self.dtype.name,
+            "rows": self._features.rows,
+            "classes": [str(c) for c in self.classes],
+            "digraph_tables": current_tables_hash() if uses_digraph_tables(self.columns) else None,
+        }
+        with open(os.path.join(self.path, SCHEMA_FILE), "w") as f:
+            json.dump(schema, f, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+def read_schema(path):
+    with open(os.path.join(path, SCHEMA_FILE)) as f:
+        return json.load(f)
+
+def check_store_schema(schema, path):
+    """Raise ``feature_schema.SchemaMismatchError`` if the store at ``path`` was
+    written by another feature schema version or with other digraph tables."""
+    check_schema_version(schema.get("schema_version"), f"feature store {path}")
+    check_tables_hash(schema.get("digraph_tables"), schema["columns"], f"feature store {path}")
+
+def load_feature_store(path, mmap_mode="r"):
+    """Return (X, label_codes, schema); X and label_codes are memory-mapped.
+
+    Raises ``feature_schema.SchemaMismatchError`` if the store does not
+    match this code (``check_store_schema``).
+    """
+    schema = read_schema(path)
+    check_store_schema(schema, path)
+    X = np.load(os.path.join(path, FEATURES_FILE), mmap_mode=mmap_mode)
+    y = np.load(os.path.join(path, LABELS_FILE), mmap_mode=mmap_mode)
+    return X, y, schema
+
+def load_feature_frame(path, with_labels=True):
+    """Store as a DataFrame whose feature block is a view of the mapped matrix."""
+    import pandas as pd
+
+    X, y, schema = load_feature_store(path)
+    df = pd.DataFrame(X, columns=schema["columns"], copy=False)
+    if with_labels:
+        df["label"] = np.asarray(schema["classes"], dtype=object)[y]
+    return df
@@ -0,0 +1,107 @@
+import math
+from collections import Counter
+
+from digraph_tables import default_tables, digraph_features_text
+from feature_extraction import CHAR_POOL, rel_freq, nomor_from_counter
+from ngrams import ngram_counts, dic_from_counts, edi_from_counts, lr_from_counts
+from periodic import (
+    DEFAULT_MAX_PERIOD, encode_text, periodic_counts, lag_coincidences,
+    mic_from_counts, mka_from_coincidences,
+)
+
+# -----------------------------------------
+# ⚡ Single-pass (fused) feature extractor
+# -----------------------------------------
+# extract_features scans the same text once per helper: Counter for the
+# frequencies, text.count per distinct char for entropy, a list of ords for
+# the ASCII stats, and separate Counters for chi-square and NOMOR. Here one
+# histogram is built and every histogram-based feature is read off it; the
+# periodic and n-gram features share one integer encoding.
+
+FREQ_KEYS = [(f'freq_{ch}', ch) for ch in CHAR_POOL]
+
+def histogram_features(counter, length):
+    features = {}
+    L = length
+
+    for key, ch in FREQ_KEYS:
+        features[key] = counter.get(ch, 0) / L if L else 0
+
+    features['length'] = L
+    features['unique_chars'] = len(counter)
+
+    entropy = 0.0
+    pairs = 0
+    ascii_sum = 0
+    digits = alphas = symbols = 0
+    for ch, n in counter.items():
+        p = n / L
+        entropy -= p * math.log2(p)
+        pairs += n * (n - 1)
+        ascii_sum += ord(ch) * n
+        if ch.isdigit():
+            digits += n
+        if ch.isalpha():
+            alphas += n
+        if not ch.isalnum():
+            symbols += n
+    features['entropy'] = entropy
+
+    if L:
+        mean = ascii_sum / L
+        codes = [ord(ch) for ch in counter]
+        features['ascii_mean'] = mean
+        features['ascii_std'] = math.sqrt(sum(n * (ord(ch) - mean) ** 2 for ch, n in counter.items()) / L)
+        features['ascii_min'] = min(codes)
+        features['ascii_max'] = max(codes)
+    else:
+        features.update({"ascii_mean": 0, "ascii_std": 0, "ascii_min": 0, "ascii_max": 0})
+
+    total = L or 1
+    features['digit_ratio'] = digits / total
+    features['alpha_ratio'] = alphas / total
+    features['symbol_ratio'] = symbols / total
+
+    equals = counter.get('=', 0)
+    features['equals_count'] = equals
+    features['plus_count'] = counter.get('+', 0)
+    features['slash_count'] = counter.get('/', 0)
+    features['equals_ratio'] = equals / L if L else 0
+
+    features['IC'] = 1000 * (pairs / (L * (L - 1)) if L > 1 else 0)
+    return features
+
+def chi_square_from_counter(counter, length):
+    if length == 0:
+        return 0
+    chi_sq = 0
+    for c, rel in rel_freq.items():
+        expected = rel * length
+        chi_sq += (counter.get(c, 0) - expected) ** 2 / expected
+    return chi_sq
+
+def digraph_features(text):
+    """(LDI, SDD, RDI) from one scan for adjacent uppercase letter pairs."""
+    ldi, sdd_value, rdi = digraph_features_text(text, *default_tables())
+    return 100 * ldi, 100 * sdd_value, 100 * rdi
+
+def extract_features_fused(text, max_period=DEFAULT_MAX_PERIOD):
+    """Same columns and values as ``extract_features``, from one histogram."""
+    counter = Counter(text)
+    L = len(text)
+    features = histogram_features(counter, L)
+
+    # Cipher-specific statistical features, from one integer encoding
+    codes, n_symbols = encode_text(text)
+    features['MIC'] = 1000 * mic_from_counts(periodic_counts(codes, n_symbols, max_period), L)
+    features['MKA'] = 1000 * mka_from_coincidences(lag_coincidences(codes, max_period), L)
+    features['DIC'] = 10000 * dic_from_counts(ngram_counts(codes, n_symbols, 2), L)
+    features['EDI'] = edi_from_counts(ngram_counts(codes, n_symbols, 2, step=2), L)
+    features['LR'] = lr_from_counts(ngram_counts(codes, n_symbols, 3), L)
+    ldi, sdd_value, rdi = digraph_features(text)
+    features['LDI'] = ldi
+    features['SDD'] = sdd_value
+    features['NOMOR'] = nomor_from_counter(counter)
+    features['RDI'] = rdi
+    features['ChiSquare'] = chi_square_from_counter(counter, L)
+    return features
@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+from ciphers import CIPHERS, DEFAULT_CIPHERS, ENCODINGS, check_cipher_names
+from encryption import encrypt_batch
+
+# -----------------------------------------
+# 🚿 Synthetic payload stream at a fixed rate
+# -----------------------------------------
+# Random sentences encrypted with the ciphers of encryption.py, written one
+# per line to a TCP endpoint (e.g. async_classifier.py tcp://...) or stdout
+# at --rate lines per second. Sending is open-loop: lines are due on a fixed
+# schedule, and when the receiver applies backpressure the generator falls
+# behind and reports the rate it actually achieved.
+
+WORDS = ("the quick brown fox jumps over a lazy dog attack at dawn data is power "
+         "encrypt the message cryptography is fun hello world zebra quiz").split()
+
+TICK_SECONDS = 0.002  # send what is due, then sleep this long
+
+def make_payloads(rows, ciphers=DEFAULT_CIPHERS, encoding="base64", seed=0):
+    """``rows`` (text, label) pairs, every sentence encrypted with each cipher."""
+    rng = random.Random(seed)
+    sentences = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 16)))
+                 for _ in range(-(-rows // len(ciphers)))]
+    return encrypt_batch(sentences, seed, 0, ciphers, encoding)[:rows]
+
+async def send_lines(writer, texts, rate, duration):
+    """Write ``texts`` (cycled) at ``rate`` lines/s for ``duration`` seconds; returns lines sent."""
+    start = time.perf_counter()
+    sent = 0
+    while True:
+        elapsed = time.perf_counter() - start
+        if elapsed >= duration:
+            break
+        due = min(int(elapsed * rate), int(duration * rate)) - sent
+        if due > 0:
+            lines = [texts[(sent + i) % len(texts)] for i in range(due)]
+            writer.write(("\n".join(lines) + "\n").encode())
+            sent += due
+            await writer.drain()  # blocks while the receiver is not reading
+        await asyncio.sleep(TICK_SECONDS)
+    return sent
+
+class _StdoutWriter:
+    def write(self, data):
+        sys.stdout.buffer.write(data)
+
+    async def drain(self):
+        sys.stdout.buffer.flush()
+
+    def close(self):
+        sys.stdout.buffer.flush()
+
+async def generate(args):
+    texts = [text for text, _ in make_payloads(args.rows, args.ciphers, args.encoding, args.seed)]
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        _, writer = await asyncio.open_connection(host or "127.0.0.1", int(port))
+    else:
+        writer = _StdoutWriter()
+    start = time.perf_counter()
+    sent = await send_lines(writer, texts, args.rate, args.duration)
+    writer.close()
+    elapsed = time.perf_counter() - start
+    print(f"Sent {sent} lines in {elapsed:.2f}s ({sent / elapsed:,.0f} lines/s, target {args.rate:,.0f})",
+          file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream encrypted payloads at a fixed rate")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="send to this TCP endpoint (default: stdout)")
+    parser.add_argument("--rate", type=float, default=1000, help="lines per second")
+    parser.add_argument("--duration", type=float, default=10, help="seconds")
+    parser.add_argument("--rows", type=int, default=10_000, help="distinct payloads, cycled")
+    parser.add_argument("--ciphers", nargs="+", default=DEFAULT_CIPHERS, choices=list(CIPHERS), metavar="NAME")
+    parser.add_argument("--encoding", choices=list(ENCODINGS), default="base64")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    try:
+        check_cipher_names(args.ciphers)
+    except ValueError as e:
+        parser.error(str(e))
+    asyncio.run(generate(args))
+
+if __name__ == "__main__":
+    main()
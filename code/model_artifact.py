@@ -0,0 +1,71 @@
+import time
+
+import joblib
+
+from feature_schema import (
+    FEATURE_SCHEMA_VERSION, MODEL_TABLES_ATTR, MODEL_VERSION_ATTR, check_model, check_schema_version,
+    check_tables_hash, stamp_model,
+)
+
+# -----------------------------------------
+# 📦 Versioned model artifact (model + LabelEncoder in one file)
+# -----------------------------------------
+# A joblib file holding a dict:
+#   format_version           ARTIFACT_VERSION
+#   feature_schema_version   features the model was trained on
+#   columns                  the model's input columns, in order
+#   digraph_tables           hash of the digraph tables LDI/SDD/RDI were computed
+#                            with (None if the columns do not use them)
+#   labels                   label of each encoded class (LabelEncoder.classes_)
+#   model                    the fitted estimator
+#   metadata                 free-form training details (learner, rows, ...)
+# Predictor.load accepts an artifact in place of the separate model and
+# encoder pickles. Labels are stored as plain strings (format 1 pickled the
+# LabelEncoder, so reading it imported sklearn), and the file is written
+# uncompressed so the model's NumPy arrays are memory-mapped on load: a
+# compiled forest is then paged in on demand and shared by every process
+# that maps the same file.
+
+ARTIFACT_VERSION = 2
+READABLE_VERSIONS = (1, 2)
+
+def save_artifact(path, clf, label_encoder, metadata=None):
+    """Write ``clf`` with its labels; ``label_encoder`` is a fitted LabelEncoder or its ``classes_``."""
+    if getattr(clf, MODEL_VERSION_ATTR, None) is None:
+        stamp_model(clf)
+    columns = check_model(clf)
+    artifact = {
+        "format_version": ARTIFACT_VERSION,
+        "feature_schema_version": FEATURE_SCHEMA_VERSION,
+        "columns": columns,
+        "digraph_tables": getattr(clf, MODEL_TABLES_ATTR, None),
+        "labels": [str(label) for label in getattr(label_encoder, "classes_", label_encoder)],
+        "model": clf,
+        "metadata": dict(metadata or {}, saved=time.strftime("%Y-%m-%dT%H:%M:%S")),
+    }
+    joblib.dump(artifact, path)
+    return artifact
+
+def is_artifact(obj):
+    return isinstance(obj, dict) and "format_version" in obj and "model" in obj
+
+def check_artifact(artifact, path="artifact"):
+    """Raise ValueError unless ``artifact`` can be used by this code."""
+    if artifact["format_version"] not in READABLE_VERSIONS:
+        raise ValueError(f"{path} has artifact format {artifact['format_version']}, expected {ARTIFACT_VERSION}")
+    check_schema_version(artifact["feature_schema_version"], path)
+    columns = artifact.get("columns") or list(getattr(artifact["model"], "feature_names_in_", []))
+    check_tables_hash(artifact.get("digraph_tables"), columns, path)
+    return artifact
+
+def artifact_labels(artifact):
+    """Label of each encoded class, for any readable format."""
+    if "labels" in artifact:
+        return artifact["labels"]
+    return [str(label) for label in artifact["label_encoder"].classes_]
+
+def load_artifact(path, mmap_mode="r"):
+    obj = joblib.load(path, mmap_mode=mmap_mode)
+    if not is_artifact(obj):
+        raise ValueError(f"{path} is not a model artifact (save one with model_artifact.save_artifact)")
+    return check_artifact(obj, path)
@@ -0,0 +1,96 @@
+import math
+
+import numpy as np
+
+from periodic import encode_text
+
+# -----------------------------------------
+# 🔗 Integer n-gram counting (DIC / EDI / LR)
+# -----------------------------------------
+# Symbols are mapped to codes 0..S-1, so an n-gram packs into one integer
+# c0 * S^(n-1) + ... + c(n-1). Counting those keys with np.unique avoids
+# slicing and hashing one small string per position.
+
+def ngram_keys(codes, n_symbols, n, step=1):
+    """Packed keys of the n-grams starting at positions 0, step, 2*step, ..."""
+    starts = np.arange(0, len(codes) - n + 1, step)
+    keys = np.zeros(len(starts), dtype=np.int64)
+    for k in range(n):
+        keys = keys * n_symbols + codes[starts + k]
+    return keys
+
+def ngram_counts(codes, n_symbols, n, step=1):
+    """Occurrence count of every distinct n-gram (order unspecified)."""
+    return np.unique(ngram_keys(codes, n_symbols, n, step), return_counts=True)[1]
+
+def _pairs(counts):
+    return int((counts * (counts - 1)).sum())
+
+def dic_from_counts(bigram_counts, length):
+    total = length - 1
+    return _pairs(bigram_counts) / (total * (total - 1)) if total > 1 else 0
+
+def edi_from_counts(even_bigram_counts, length):
+    if length <= 2:
+        return 0
+    return 4 * _pairs(even_bigram_counts) / (length * (length - 2))
+
+def lr_from_counts(trigram_counts, length):
+    if length == 0:
+        return 0
+    return 1000 * math.sqrt(int((trigram_counts - 1).sum())) / length
+
+def text_ngram_stats(text):
+    """(DIC, EDI, LR) of one text, unscaled, from a single integer encoding."""
+    codes, n_symbols = encode_text(text)
+    L = len(codes)
+    return (
+        dic_from_counts(ngram_counts(codes, n_symbols, 2), L),
+        edi_from_counts(ngram_counts(codes, n_symbols, 2, step=2), L),
+        lr_from_counts(ngram_counts(codes, n_symbols, 3), L),
+    )
+
+# -----------------------------------------
+# 📦 Batch versions over a padded byte matrix
+# -----------------------------------------
+
+def _grouped_counts(keys, rows, base, n_rows):
+    # Count (row, key) pairs, then fold the per-ngram counts back onto rows
+    uniq, counts = np.unique(rows * base + keys, return_counts=True)
+    owner = uniq // base
+    pairs = np.bincount(owner, weights=counts * (counts - 1), minlength=n_rows)
+    distinct = np.bincount(owner, minlength=n_rows)
+    return pairs, distinct
+
+def ngram_features_batch(matrix, lengths):
+    """DIC, EDI and LR (unscaled) for every row of a padded uint8 matrix."""
+    n, width = matrix.shape
+    columns = np.arange(width)
+    valid = columns < lengths[:, None]
+    symbols, inverse = np.unique(matrix[valid], return_inverse=True)  # compact alphabet
+    S = max(len(symbols), 1)
+    codes = np.zeros(matrix.shape, dtype=np.int64)
+    codes[valid] = inverse.ravel()
+    row_ids = np.broadcast_to(np.arange(n)[:, None], matrix.shape)
+    L = lengths.astype(np.float64)
+
+    def windows(k, step=1):
+        # keys and owning rows of every k-gram that fits inside its row
+        starts = columns[:width - k + 1:step]
+        keys = np.zeros((n, len(starts)), dtype=np.int64)
+        for i in range(k):
+            keys = keys * S + codes[:, starts + i]
+        fits = starts + k <= lengths[:, None]
+        return keys[fits], row_ids[:, :len(starts)][fits]
+
+    bigram_total = L - 1
+    pairs, _ = _grouped_counts(*windows(2), S ** 2, n)
+    dic = np.divide(pairs, bigram_total * (bigram_total - 1), out=np.zeros(n), where=bigram_total > 1)
+
+    pairs, _ = _grouped_counts(*windows(2, step=2), S ** 2, n)
+    edi = np.divide(4 * pairs, L * (L - 2), out=np.zeros(n), where=L > 2)
+
+    trigram_total = np.maximum(L - 2, 0)
+    _, distinct = _grouped_counts(*windows(3), S ** 3, n)
+    lr = np.divide(1000 * np.sqrt(trigram_total - distinct), L, out=np.zeros(n), where=L > 0)
+    return dic, edi, lr
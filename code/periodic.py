@@ -0,0 +1,100 @@
+import numpy as np
+
+# -----------------------------------------
+# 🔁 Periodic IC kernel (MIC / MKA)
+# -----------------------------------------
+# Both statistics look at the text split by period p = 1..max_period:
+#   MIC - mean IC of the p residue columns, maximised over p
+#   MKA - fraction of positions i with text[i] == text[i + p], maximised over p
+# Instead of re-walking the text once per (start, period) pair, one pass
+# fills a (period x residue x symbol) count tensor and a lag-coincidence
+# vector, and both statistics are read off those.
+
+DEFAULT_MAX_PERIOD = 15
+
+def encode_text(text):
+    """Map each character to a small integer code. Returns (codes, n_symbols)."""
+    points = np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+    symbols, codes = np.unique(points, return_inverse=True)
+    return codes.ravel(), len(symbols)
+
+def periodic_counts(codes, n_symbols, max_period=DEFAULT_MAX_PERIOD):
+    """Count tensor T[p - 1, r, s]: occurrences of symbol s at positions i % p == r.
+
+    Residues r >= p are unused and stay zero.
+    """
+    periods = np.arange(1, max_period + 1)
+    residues = np.arange(len(codes))[None, :] % periods[:, None]
+    keys = ((periods[:, None] - 1) * max_period + residues) * n_symbols + codes[None, :]
+    counts = np.bincount(keys.ravel(), minlength=max_period * max_period * n_symbols)
+    return counts.reshape(max_period, max_period, n_symbols)
+
+def lag_coincidences(codes, max_period=DEFAULT_MAX_PERIOD):
+    """C[p - 1] = number of positions i with codes[i] == codes[i + p]."""
+    # Row i of the window view is codes[i .. i + max_period]; the -1 padding
+    # never matches, so lags running past the end count nothing.
+    padded = np.concatenate((codes, np.full(max_period + 1, -1, dtype=codes.dtype)))
+    windows = np.lib.stride_tricks.sliding_window_view(padded, max_period + 1)[:len(codes)]
+    return np.count_nonzero(windows[:, 1:] == windows[:, :1], axis=0)
+
+def _column_ic(counts):
+    # IC of every residue column: sum f(f-1) / (m(m-1)), 0 when m <= 1
+    m = counts.sum(axis=-1)
+    pairs = (counts * (counts - 1)).sum(axis=-1)
+    return np.divide(pairs, m * (m - 1), out=np.zeros(m.shape), where=m > 1)
+
+def mic_from_counts(counts, length):
+    max_period = counts.shape[0]
+    usable = min(max_period, length - 1)
+    if usable < 1:
+        return 0.0
+    # Unused residues (r >= p) have zero counts, hence zero IC
+    means = _column_ic(counts).sum(axis=1) / np.arange(1, max_period + 1)
+    return float(means[:usable].max())
+
+def mka_from_coincidences(coincidences, length):
+    return max(
+        coincidences[p - 1] / (length - p) if length > p else 0
+        for p in range(1, len(coincidences) + 1)
+    )
+
+# -----------------------------------------
+# 📦 Batch versions over a padded byte matrix
+# -----------------------------------------
+
+def periodic_features_batch(matrix, lengths, max_period=DEFAULT_MAX_PERIOD):
+    """MIC and MKA (unscaled) for every row of a padded uint8 matrix."""
+    n, width = matrix.shape
+    columns = np.arange(width)
+    valid = columns < lengths[:, None]
+    # Compact alphabet through a byte lookup table (no sort); int32 indices
+    # whenever the largest (row, residue, symbol) key fits
+    present = np.zeros(256, dtype=bool)
+    present[matrix[valid]] = True
+    n_symbols = int(present.sum())
+    index = np.int32 if n * max_period * n_symbols < 2 ** 31 else np.int64
+    values = (np.cumsum(present) - 1).astype(index)[matrix[valid]]
+    rows = np.repeat(np.arange(n, dtype=index), lengths)
+    positions = np.broadcast_to(columns.astype(index), matrix.shape)[valid]
+
+    mic = np.zeros(n)
+    mka = np.zeros(n)
+    for p in range(1, max_period + 1):
+        # MIC: IC of each (row, residue) column, averaged over the p residues.
+        # sum f(f-1) over a column = sum over its positions of (count of that
+        # position's symbol - 1), so only the real positions are touched,
+        # never the sparse n * p * n_symbols count tensor; a column holds
+        # ceil((length - r) / p) positions.
+        column = rows * p + positions % p
+        keys = column * n_symbols + values
+        pairs = np.bincount(column, weights=np.bincount(keys)[keys] - 1, minlength=n * p).reshape(n, p)
+        m = (lengths[:, None] - np.arange(p) + p - 1) // p
+        mean_ic = np.divide(pairs, m * (m - 1), out=np.zeros((n, p)), where=m > 1).mean(axis=1)
+        mic = np.where(p <= lengths - 1, np.maximum(mic, mean_ic), mic)
+
+        # MKA: coincidences at lag p inside the real part of each row
+        if p < width:
+            hits = (matrix[:, :-p] == matrix[:, p:]) & (columns[:-p] < lengths[:, None] - p)
+            rate = np.divide(hits.sum(axis=1), lengths - p, out=np.zeros(n), where=lengths > p)
+            mka = np.maximum(mka, rate)
+    return mic, mka
@@ -0,0 +1,191 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from feature_cache import FeatureCache
+from predictor import Predictor, DEFAULT_MODEL_PATH, DEFAULT_ENCODER_PATH
+from profiling import PROFILER, enable as enable_profiling
+
+# -----------------------------------------
+# 🛰️ Long-running prediction server with micro-batching
+# -----------------------------------------
+# POST /predict  {"texts": ["...", ...]}  (or {"text": "..."})
+#   -> {"predictions": [{"label": ..., "probabilities": {class: p}}], "latency_ms": ...}
+# GET  /stats    -> request count, latency percentiles and feature-cache counters
+# GET  /metrics  -> Prometheus text from the profiler (with --profile)
+#
+# Handler threads only enqueue their texts. One batching thread drains the
+# queue into batches of up to --max-batch texts, waiting at most
+# --max-wait-ms after the first text, and runs one predict_proba per batch.
+
+class MicroBatcher:
+    def __init__(self, predictor, max_batch_size=256, max_wait_ms=5.0):
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, texts):
+        """Queue texts; returns one Future per text resolving to (label, probabilities)."""
+        futures = []
+        for text in texts:
+            future = Future()
+            self._queue.put((text, future))
+            futures.append(future)
+        return futures
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            texts = [text for text, _ in batch]
+            try:
+                labels, proba = self.predictor.predict_proba(texts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), label, row in zip(batch, labels, proba):
+                future.set_result((label, row))
+
+class LatencyTracker:
+    def __init__(self, window=10_000):
+        self._samples = deque(maxlen=window)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds * 1000)
+            self._count += 1
+
+    def summary(self):
+        with self._lock:
+            samples = np.array(self._samples)
+            count = self._count
+        if not len(samples):
+            return {"requests": count}
+        p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+        return {
+            "requests": count,
+            "window": len(samples),
+            "p50_ms": round(p50, 3),
+            "p90_ms": round(p90, 3),
+            "p99_ms": round(p99, 3),
+            "max_ms": round(samples.max(), 3),
+        }
+
+class PredictionHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # the default backlog of 5 resets bursts of clients
+
+def make_handler(batcher, latency):
+    classes = batcher.predictor.classes
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, payload, content_type="application/json"):
+            body = payload.encode() if isinstance(payload, str) else json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                stats = latency.summary()
+                if batcher.predictor.cache is not None:
+                    stats["cache"] = batcher.predictor.cache.stats()
+                self._send(200, stats)
+            elif self.path == "/metrics" and PROFILER.enabled:
+                self._send(200, PROFILER.prometheus(), "text/plain; version=0.0.4")
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send(404, {"error": "not found"})
+                return
+            start = time.perf_counter()
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                if not isinstance(payload, dict):
+                    raise TypeError("payload is not an object")
+                texts = payload["texts"] if "texts" in payload else [payload["text"]]
+                if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                    raise TypeError("texts must be a list of strings")
+            except (ValueError, KeyError, TypeError):
+                self._send(400, {"error": 'expected a JSON object {"texts": ["...", ...]} or {"text": "..."}'})
+                return
+
+            try:
+                results = [future.result() for future in batcher.submit(texts)]
+            except Exception as e:
+                self._send(500, {"error": str(e)})
+                return
+
+            elapsed = time.perf_counter() - start
+            latency.record(elapsed)
+            self._send(200, {
+                "predictions": [
+                    {"label": label, "probabilities": dict(zip(classes, map(float, row)))}
+                    for label, row in results
+                ],
+                "latency_ms": round(elapsed * 1000, 3),
+            })
+
+        def log_message(self, format, *args):
+            pass  # keep the console quiet under load
+
+    return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve encryption-type predictions over HTTP")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--encoder", default=DEFAULT_ENCODER_PATH)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=256, help="largest micro-batch")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="longest wait to fill a micro-batch")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="in-memory LRU entries for repeated texts (0 = none; with --cache-db, disk only)")
+    parser.add_argument("--cache-db", metavar="PATH", help="sqlite feature cache reused across restarts")
+    parser.add_argument("--profile", action="store_true", help="record per-stage and per-feature timings at GET /metrics")
+    args = parser.parse_args()
+
+    if args.profile:
+        enable_profiling()
+
+    cache = FeatureCache(args.cache_size, args.cache_db) if args.cache_size or args.cache_db else None
+    predictor = Predictor.load(args.model, args.encoder, cache)
+    batcher = MicroBatcher(predictor, args.max_batch, args.max_wait_ms)
+    server = PredictionHTTPServer((args.host, args.port), make_handler(batcher, LatencyTracker()))
+    print(f"Serving {len(predictor.classes)} classes on http://{args.host}:{args.port} (POST /predict, GET /stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import joblib
+import numpy as np
+
+from feature_schema import check_model, feature_frame, feature_matrix
+from model_artifact import artifact_labels, check_artifact, is_artifact
+from profiling import stage
+
+# -----------------------------------------
+# 🎯 Batch predictor (model + label encoder loaded once)
+# -----------------------------------------
+
+DEFAULT_MODEL_PATH = r"F:\minor_project2\model\trial_1\encrytion_model.pkl"
+DEFAULT_ENCODER_PATH = r"F:\minor_project2\model\trial_1\label_encoder.pkl"
+
+# Early exit: classify growing prefixes, stop once the model is confident
+DEFAULT_PREFIX_SIZES = (256, 1024, 4096, 16384, 65536)
+DEFAULT_EXIT_THRESHOLD = 0.7  # from bench_early_exit.py: whole-text accuracy at ~1/3 of the reading
+
+class Predictor:
+    """Wraps a fitted classifier and its ``LabelEncoder`` for batch inference.
+
+    Features come from ``feature_schema.feature_frame`` (the same float32
+    features the training store holds) and are restricted to the columns the
+    model was fitted on (``feature_names_in_``). Groups the notebook dropped
+    (lowercase frequencies, LDI, RDI) are not even computed. Raises
+    ``feature_schema.SchemaMismatchError`` for a model trained on another
+    schema version. Models that take plain arrays (``accepts_arrays``, e.g.
+    ``compiled_forest.CompiledForest``) get the float32 matrix without a
+    DataFrame around it.
+    """
+
+    def __init__(self, clf, label_encoder, cache=None):
+        self.columns = check_model(clf)
+        self.clf = clf
+        self.cache = cache
+        self.accepts_arrays = getattr(clf, "accepts_arrays", False)
+        self.label_encoder = label_encoder
+        # A fitted LabelEncoder or just its classes_; predict_proba columns
+        # follow clf.classes_ (the encoded labels)
+        labels = getattr(label_encoder, "classes_", label_encoder)
+        self.classes = [labels[i] for i in clf.classes_]
+
+    @classmethod
+    def load(cls, model_path=DEFAULT_MODEL_PATH, encoder_path=DEFAULT_ENCODER_PATH, cache=None):
+        """Load a model and its encoder, or a ``model_artifact`` (then ``encoder_path`` is ignored).
+
+        Large arrays are memory-mapped from the file rather than read.
+        """
+        model = joblib.load(model_path, mmap_mode="r")
+        if is_artifact(model):
+            check_artifact(model, model_path)
+            return cls(model["model"], artifact_labels(model), cache)
+        return cls(model, joblib.load(encoder_path), cache)
+
+    def features(self, texts):
+        # Only the feature groups behind self.columns are computed
+        if self.accepts_arrays:
+            return feature_matrix(texts, cache=self.cache, columns=self.columns)
+        return feature_frame(texts, cache=self.cache, columns=self.columns)
+
+    def predict_proba(self, texts):
+        """Return (labels, probabilities) for a list of texts in one model call."""
+        if len(texts) == 0:
+            return [], np.zeros((0, len(self.classes)))
+        with stage("extract", len(texts)):
+            features = self.features(texts)
+        with stage("predict", len(texts)):
+            proba = self.clf.predict_proba(features)
+        labels = [self.classes[i] for i in proba.argmax(axis=1)]
+        return labels, proba
+
+    def predict_proba_early(self, texts, prefix_sizes=DEFAULT_PREFIX_SIZES, threshold=DEFAULT_EXIT_THRESHOLD):
+        """Return (labels, probabilities, chars_read), classifying long texts by prefix.
+
+        Every text is first classified on its first ``prefix_sizes[0]``
+        characters; those whose top probability reaches ``threshold`` (or
+        that fit in the prefix) are done, the rest move on to the next
+        prefix size and finally to the whole text. Features are recomputed
+        per prefix, which with sizes growing 4x costs at most a third more
+        than the last prefix read -- far less than the whole of a long text.
+        """
+        texts = [str(t) for t in texts]
+        proba = np.zeros((len(texts), len(self.classes)))
+        chars_read = np.zeros(len(texts), dtype=np.int64)
+        active = np.arange(len(texts))
+        for size in list(prefix_sizes) + [None]:
+            if not len(active):
+                break
+            prefixes = [texts[i][:size] for i in active]
+            _, proba[active] = self.predict_proba(prefixes)
+            chars_read[active] = [len(p) for p in prefixes]
+            whole = np.array([len(texts[i]) for i in active]) <= chars_read[active]
+            active = active[~(whole | (proba[active].max(axis=1) >= threshold))]
+        labels = [self.classes[i] for i in proba.argmax(axis=1)]
+        return labels, proba, chars_read
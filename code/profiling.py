@@ -0,0 +1,202 @@
+import functools
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# -----------------------------------------
+# 🔬 Opt-in profiling: feature functions and pipeline stages
+# -----------------------------------------
+# Off by default and then free: nothing is wrapped, and stage() returns a
+# shared no-op context. enable() (or CIPHER_PROFILE=1 in the environment)
+# wraps the extract_features helpers and the batch (text and byte) feature
+# groups in place, and stages (load, extract, write, predict) start
+# recording. For every name we keep cumulative wall time, call count and a
+# histogram of input sizes (chars for text helpers, texts for batch groups
+# and stages). Export with report() or prometheus().
+
+SIZE_BUCKETS = (8, 16, 32, 64, 128, 256, 512, 1024, 4096, 16384, 65536)
+
+class _Series:
+    __slots__ = ("seconds", "calls", "size_sum", "buckets")
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.calls = 0
+        self.size_sum = 0
+        self.buckets = [0] * (len(SIZE_BUCKETS) + 1)  # last one is +Inf
+
+    def add(self, seconds, size):
+        self.seconds += seconds
+        self.calls += 1
+        if size is not None:
+            self.size_sum += size
+            i = 0
+            while i < len(SIZE_BUCKETS) and size > SIZE_BUCKETS[i]:
+                i += 1
+            self.buckets[i] += 1
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.series = {"function": {}, "stage": {}}
+        self._lock = threading.Lock()
+        self._originals = []
+
+    def record(self, kind, name, seconds, size=None):
+        with self._lock:
+            series = self.series[kind].get(name)
+            if series is None:
+                series = self.series[kind][name] = _Series()
+            series.add(seconds, size)
+
+    def reset(self):
+        with self._lock:
+            self.series = {"function": {}, "stage": {}}
+
+    def wrap(self, fn, name):
+        """``fn`` recording into the ``function`` series ``name``."""
+        record = self.record
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                size = len(args[0]) if args and hasattr(args[0], "__len__") else None
+                record("function", name, time.perf_counter() - start, size)
+        return wrapper
+
+    # -- export ------------------------------------------------------------
+
+    def report(self):
+        """Plain-text table per kind, most expensive first."""
+        lines = []
+        with self._lock:
+            for kind, entries in self.series.items():
+                if not entries:
+                    continue
+                lines.append(f"{kind:28} {'calls':>10} {'total s':>10} {'mean us':>10} {'mean size':>10}")
+                for name, s in sorted(entries.items(), key=lambda item: -item[1].seconds):
+                    mean_us = 1e6 * s.seconds / s.calls if s.calls else 0.0
+                    mean_size = s.size_sum / s.calls if s.calls else 0.0
+                    lines.append(f"{name:28} {s.calls:10d} {s.seconds:10.3f} {mean_us:10.1f} {mean_size:10.1f}")
+                lines.append("")
+        return "\n".join(lines)
+
+    def prometheus(self, prefix="cipher"):
+        """Prometheus text exposition format (counters and size histograms)."""
+        lines = []
+        with self._lock:
+            for kind, entries in self.series.items():
+                metric = f"{prefix}_{kind}"
+                lines.append(f"# HELP {metric}_seconds_total Cumulative wall time per {kind}")
+                lines.append(f"# TYPE {metric}_seconds_total counter")
+                lines += [f'{metric}_seconds_total{{{kind}="{n}"}} {s.seconds:.9f}' for n, s in entries.items()]
+                lines.append(f"# HELP {metric}_calls_total Calls per {kind}")
+                lines.append(f"# TYPE {metric}_calls_total counter")
+                lines += [f'{metric}_calls_total{{{kind}="{n}"}} {s.calls}' for n, s in entries.items()]
+                lines.append(f"# HELP {metric}_input_size Input size per call (chars or texts)")
+                lines.append(f"# TYPE {metric}_input_size histogram")
+                for name, s in entries.items():
+                    cumulative = 0
+                    for bound, count in zip(SIZE_BUCKETS + ("+Inf",), s.buckets):
+                        cumulative += count
+                        lines.append(f'{metric}_input_size_bucket{{{kind}="{name}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{metric}_input_size_sum{{{kind}="{name}"}} {s.size_sum}')
+                    lines.append(f'{metric}_input_size_count{{{kind}="{name}"}} {cumulative}')
+        return "\n".join(lines) + "\n"
+
+PROFILER = Profiler()
+_NULL_CONTEXT = nullcontext()
+
+class _Stage:
+    __slots__ = ("name", "size", "start")
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        PROFILER.record("stage", self.name, time.perf_counter() - self.start, self.size)
+
+def stage(name, size=None):
+    """Context manager timing a pipeline stage; a no-op while profiling is off."""
+    if not PROFILER.enabled:
+        return _NULL_CONTEXT
+    return _Stage(name, size)
+
+def timed_iter(iterable, name):
+    """Yield from ``iterable``, timing each step as stage ``name`` (e.g. CSV loading)."""
+    if not PROFILER.enabled:
+        yield from iterable
+        return
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        size = len(item) if hasattr(item, "__len__") else None
+        PROFILER.record("stage", name, time.perf_counter() - start, size)
+        yield item
+
+# -----------------------------------------
+# 🔌 Switching instrumentation on and off
+# -----------------------------------------
+
+def _patch(owner, key, name):
+    # owner is a module (attribute) or a dict (item)
+    if isinstance(owner, dict):
+        original = owner[key]
+        owner[key] = PROFILER.wrap(original, name)
+    else:
+        original = getattr(owner, key)
+        setattr(owner, key, PROFILER.wrap(original, name))
+    PROFILER._originals.append((owner, key, original))
+
+def enable():
+    """Wrap the feature functions and start recording stages."""
+    if PROFILER.enabled:
+        return
+    import batch_features
+    import byte_features
+    import feature_extraction
+
+    for name in feature_extraction.FEATURE_FUNCTIONS + ("extract_features",):
+        _patch(feature_extraction, name, name)
+    for group in list(batch_features.GROUP_EXTRACTORS):
+        _patch(batch_features.GROUP_EXTRACTORS, group, f"group.{group}")
+    for group in list(byte_features.BYTE_GROUP_EXTRACTORS):
+        _patch(byte_features.BYTE_GROUP_EXTRACTORS, group, f"group.{group}")
+    PROFILER.enabled = True
+
+def disable():
+    """Restore the original functions; recorded numbers are kept."""
+    for owner, key, original in reversed(PROFILER._originals):
+        if isinstance(owner, dict):
+            owner[key] = original
+        else:
+            setattr(owner, key, original)
+    PROFILER._originals.clear()
+    PROFILER.enabled = False
+
+def write_profile(path):
+    """Write the profile to ``path``: Prometheus text for *.prom, the report otherwise ('-' = stderr)."""
+    import sys
+
+    text = PROFILER.prometheus() if path.endswith(".prom") else PROFILER.report()
+    if path == "-":
+        sys.stderr.write(text + "\n")
+    else:
+        with open(path, "w") as f:
+            f.write(text)
+
+if os.environ.get("CIPHER_PROFILE", "") not in ("", "0"):
+    enable()
@@ -0,0 +1,138 @@
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from batch_features import extract_features_frame
+from feature_schema import FEATURE_COLUMNS, FEATURE_SCHEMA_VERSION, check_tables_hash, current_tables_hash
+from streaming import iter_csv_chunks
+
+# -----------------------------------------
+# 🗂️ Sharded, resumable feature extraction
+# -----------------------------------------
+# The input CSV is cut into fixed-size chunks. Chunk i is written to
+# part-0000i.csv inside the shard directory and recorded in manifest.json
+# once the file is complete, so a rerun only processes what is missing.
+# Merged outputs (one CSV, or a feature store) are written under a temporary
+# name and moved into place at the end, so an interrupted merge never leaves
+# a truncated output that looks complete.
+
+MANIFEST_NAME = "manifest.json"
+DEFAULT_CHUNKSIZE = 50_000
+
+def shard_name(index):
+    return f"part-{index:05d}.csv"
+
+def load_manifest(shard_dir):
+    path = os.path.join(shard_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def save_manifest(shard_dir, manifest):
+    path = os.path.join(shard_dir, MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)  # atomic, a crash never leaves half a manifest
+
+def _extract_shard(chunk, shard_path):
+    feature_df = extract_features_frame(chunk)
+    tmp_path = shard_path + ".tmp"
+    feature_df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, shard_path)
+    return len(feature_df)
+
+def run_sharded(input_csv, shard_dir, chunksize=DEFAULT_CHUNKSIZE, workers=None):
+    """Extract features for ``input_csv`` into shards, resuming a previous run.
+
+    Returns the manifest. Raises ``ValueError`` if ``shard_dir`` holds shards
+    from a different input or chunk size, since their boundaries would not
+    line up, or from another feature schema version.
+    """
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(shard_dir, exist_ok=True)
+
+    manifest = load_manifest(shard_dir)
+    source = os.path.abspath(input_csv)
+    if manifest is None:
+        manifest = {"input": source, "chunksize": chunksize, "schema_version": FEATURE_SCHEMA_VERSION,
+                    "digraph_tables": current_tables_hash(), "done": {}}
+        save_manifest(shard_dir, manifest)
+    elif manifest["input"] != source or manifest["chunksize"] != chunksize:
+        raise ValueError(
+            f"{shard_dir} was built from {manifest['input']} with chunksize "
+            f"{manifest['chunksize']}; use a fresh shard directory"
+        )
+    elif manifest.get("schema_version") != FEATURE_SCHEMA_VERSION:
+        raise ValueError(
+            f"{shard_dir} holds features of schema version {manifest.get('schema_version')}, "
+            f"not {FEATURE_SCHEMA_VERSION}; use a fresh shard directory"
+        )
+    else:
+        check_tables_hash(manifest.get("digraph_tables"), FEATURE_COLUMNS, shard_dir)
+
+    done = manifest["done"]
+    pending = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for index, chunk in enumerate(iter_csv_chunks(input_csv, chunksize)):
+            name = shard_name(index)
+            if name in done:
+                continue
+            # Keep only a couple of chunks per worker in flight
+            while len(pending) >= 2 * workers:
+                _collect(wait(pending, return_when=FIRST_COMPLETED).done, pending, shard_dir, manifest)
+            future = pool.submit(_extract_shard, chunk, os.path.join(shard_dir, name))
+            pending[future] = name
+        _collect(wait(pending).done, pending, shard_dir, manifest)
+
+    manifest["complete"] = True
+    save_manifest(shard_dir, manifest)
+    return manifest
+
+def _collect(finished, pending, shard_dir, manifest):
+    for future in finished:
+        name = pending.pop(future)
+        manifest["done"][name] = future.result()
+        save_manifest(shard_dir, manifest)
+        print(f"  {name}: {manifest['done'][name]} rows")
+
+def merge_shards(shard_dir, output_csv):
+    """Concatenate finished shards, in order, into one CSV."""
+    manifest = load_manifest(shard_dir)
+    if not manifest or not manifest.get("complete"):
+        raise ValueError(f"{shard_dir} has no complete manifest; run the extraction first")
+
+    names = sorted(manifest["done"])
+    tmp_path = output_csv + ".tmp"
+    with open(tmp_path, "w", newline="") as out:
+        for i, name in enumerate(names):
+            with open(os.path.join(shard_dir, name), newline="") as shard:
+                if i > 0:
+                    shard.readline()  # header already written
+                for line in shard:
+                    out.write(line)
+    os.replace(tmp_path, output_csv)
+
+def merge_shards_to_store(shard_dir, store_dir):
+    """Write finished shards, in order, as the feature store ``store_dir`` (replacing any store there)."""
+    import pandas as pd
+    from feature_store import FeatureStoreWriter
+
+    manifest = load_manifest(shard_dir)
+    if not manifest or not manifest.get("complete"):
+        raise ValueError(f"{shard_dir} has no complete manifest; run the extraction first")
+
+    base = store_dir.rstrip("/\\")
+    tmp_dir, old_dir = base + ".tmp", base + ".old"
+    shutil.rmtree(tmp_dir, ignore_errors=True)  # left over from an interrupted merge
+    with FeatureStoreWriter(tmp_dir) as store:
+        for name in sorted(manifest["done"]):
+            store.append(pd.read_csv(os.path.join(shard_dir, name)))
+    # A directory cannot replace a non-empty one: move the old store aside first
+    if os.path.exists(store_dir):
+        shutil.rmtree(old_dir, ignore_errors=True)
+        os.replace(store_dir, old_dir)
+    os.replace(tmp_dir, store_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
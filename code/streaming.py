@@ -0,0 +1,44 @@
+import os
+
+import pandas as pd
+
+from profiling import stage, timed_iter
+
+# -----------------------------------------
+# 🌊 Chunked CSV streaming
+# -----------------------------------------
+# Read a bounded number of rows, transform them, append them to the output
+# and drop them. Peak memory depends on the chunk size, not the file size.
+
+DEFAULT_CHUNKSIZE = 10_000
+
+def iter_csv_chunks(path, chunksize=DEFAULT_CHUNKSIZE, **read_kwargs):
+    """Yield DataFrames of at most ``chunksize`` rows from ``path``."""
+    yield from pd.read_csv(path, chunksize=chunksize, **read_kwargs)
+
+def append_csv(df, path, first):
+    """Write ``df`` to ``path``, truncating and adding a header on the first chunk."""
+    df.to_csv(path, mode="w" if first else "a", header=first, index=False)
+
+def stream_transform(input_csv, output_csv, transform, chunksize=DEFAULT_CHUNKSIZE, **read_kwargs):
+    """Apply ``transform`` chunk by chunk from ``input_csv`` to ``output_csv``.
+
+    ``transform`` takes and returns a DataFrame. The output is written to a
+    temporary file and renamed at the end, so an interrupted run never
+    leaves a truncated CSV behind. Returns the number of rows written.
+    """
+    tmp_path = output_csv + ".tmp"
+    rows = 0
+    first = True
+    for chunk in timed_iter(iter_csv_chunks(input_csv, chunksize, **read_kwargs), "load"):
+        with stage("extract", len(chunk)):
+            out = transform(chunk)
+        with stage("write", len(out)):
+            append_csv(out, tmp_path, first)
+        rows += len(out)
+        first = False
+
+    if first:  # empty input: still produce a (header-less) file
+        open(tmp_path, "w").close()
+    os.replace(tmp_path, output_csv)
+    return rows
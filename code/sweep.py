@@ -0,0 +1,330 @@
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from feature_schema import BYTE_FEATURE_GROUPS, FEATURE_GROUPS
+from feature_store import load_feature_store, read_schema
+from train import DEFAULT_DROP_GROUPS
+
+# -----------------------------------------
+# 🧪 Parallel model / hyperparameter / feature-subset sweep
+# -----------------------------------------
+# Every combination of model, hyperparameters and feature subset is one job
+# in a process pool. Workers memory-map the same feature store, so the
+# matrix is read from disk once and its pages are shared; a job only copies
+# the rows and columns it trains on. Rows are split once (seeded) into
+# train / validation / test. Forests grow in steps and SGD runs epoch by
+# epoch, both stopping early once validation accuracy stops improving.
+# Each result records test accuracy, train time, pickled model size and
+# inference latency (per row in a batch, and for a single row), one JSON
+# line per job. Every result also records the run setup (store path, rows,
+# columns, split fractions, seed, stopping rule); a rerun skips the jobs
+# already in the results file under the same setup and ignores the rest.
+# Permutation importance for the picked model shuffles whole feature groups
+# on a sample of test rows rather than every column over the full split.
+
+MODELS = {
+    "forest": {"n_estimators": [100], "max_depth": [None, 20, 12], "min_samples_leaf": [1, 5]},
+    "nb": {"var_smoothing": [1e-9, 1e-6]},
+    "svc": {"C": [1.0, 10.0]},
+    "sgd": {"alpha": [1e-4, 1e-5]},
+}
+MAX_TRAIN_ROWS = {"svc": 20_000}  # kernel SVC training is quadratic in rows
+
+FEATURE_SETS = {
+    "all": (),
+    "notebook": DEFAULT_DROP_GROUPS,
+    "no_char_freq": ("freq_lower", "freq_upper", "freq_digit", "freq_punct"),
+    "no_byte_hist": ("byte_hist",),
+}
+
+FOREST_STEP = 25  # trees added between validation checks
+MAX_EPOCHS = 20   # SGD passes
+
+def feature_set_columns(columns, name):
+    groups = dict(FEATURE_GROUPS, **BYTE_FEATURE_GROUPS)
+    dropped = {c for group in FEATURE_SETS[name] for c in groups[group]}
+    return [c for c in columns if c not in dropped]
+
+def distinct_feature_sets(columns, names):
+    """``names`` minus the sets that keep the same columns of the store as an
+    earlier one (e.g. "no_byte_hist" on a text store is just "all").
+
+    Returns (kept names, {skipped name: the kept name it repeats}).
+    """
+    kept, skipped, seen = [], {}, {}
+    for name in names:
+        resolved = tuple(feature_set_columns(columns, name))
+        if resolved in seen:
+            skipped[name] = seen[resolved]
+        else:
+            seen[resolved] = name
+            kept.append(name)
+    return kept, skipped
+
+def expand_jobs(models, feature_sets, grid):
+    for model in models:
+        names = sorted(grid[model])
+        for values in itertools.product(*(grid[model][n] for n in names)):
+            for feature_set in feature_sets:
+                yield {"model": model, "params": dict(zip(names, values)), "features": feature_set}
+
+def job_key(job):
+    return json.dumps([job["model"], job["params"], job["features"]], sort_keys=True)
+
+def run_setup(store_path, val_fraction, test_fraction, tol, patience, seed):
+    """What a job's result depends on besides the job: the data, its split and the stopping rule."""
+    schema = read_schema(store_path)
+    columns = hashlib.blake2b(json.dumps(schema["columns"]).encode(), digest_size=8).hexdigest()
+    return {"store": os.path.abspath(store_path), "rows": schema["rows"], "columns": columns,
+            "val_fraction": val_fraction, "test_fraction": test_fraction, "tol": tol, "patience": patience,
+            "seed": seed}
+
+def split_rows(n, val_fraction, test_fraction, seed):
+    order = np.random.default_rng(seed).permutation(n)
+    n_test, n_val = int(n * test_fraction), int(n * val_fraction)
+    test, val, train = order[:n_test], order[n_test:n_test + n_val], order[n_test + n_val:]
+    return np.sort(train), np.sort(val), np.sort(test)
+
+# -----------------------------------------
+# 🏭 Worker side
+# -----------------------------------------
+
+_STORE = {}
+
+def _store(path):
+    if path not in _STORE:
+        _STORE[path] = load_feature_store(path)  # memory-mapped, once per process
+    return _STORE[path]
+
+def _rows(X, rows, index):
+    return np.ascontiguousarray(X[np.ix_(rows, index)], dtype=np.float32)
+
+def group_importance(model, X, y, columns, n_repeats=3, seed=0):
+    """Mean accuracy drop when each feature group's columns are shuffled together.
+
+    One permutation per group instead of one per column, on whatever sample
+    of rows the caller passes: a few dozen predict calls, not hundreds over
+    the full test split.
+    """
+    groups = dict(FEATURE_GROUPS, **BYTE_FEATURE_GROUPS)
+    rng = np.random.default_rng(seed)
+    baseline = (model.predict(X) == y).mean()
+    drops = {}
+    for group, group_columns in groups.items():
+        index = [i for i, c in enumerate(columns) if c in set(group_columns)]
+        if not index:
+            continue
+        scores = []
+        for _ in range(n_repeats):
+            shuffled = X.copy()
+            shuffled[:, index] = X[rng.permutation(len(X))][:, index]
+            scores.append((model.predict(shuffled) == y).mean())
+        drops[group] = round(float(baseline - np.mean(scores)), 4)
+    return dict(sorted(drops.items(), key=lambda kv: -kv[1]))
+
+def _fit_with_early_stopping(model_name, params, X, y, X_val, y_val, tol, patience, seed):
+    """(fitted model, steps run, stopped early)."""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.naive_bayes import GaussianNB
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.svm import SVC
+
+    def improving(history):
+        best_before = max(history[:-patience]) if len(history) > patience else -1
+        return max(history[-patience:]) > best_before + tol
+
+    if model_name == "forest":
+        target = params["n_estimators"]
+        clf = RandomForestClassifier(**dict(params, n_estimators=min(FOREST_STEP, target)), warm_start=True,
+                                     random_state=seed, n_jobs=1)
+        history = []
+        while True:
+            clf.fit(X, y)
+            history.append((clf.predict(X_val) == y_val).mean())
+            if clf.n_estimators >= target or not improving(history):
+                return clf, clf.n_estimators, clf.n_estimators < target
+            clf.n_estimators = min(clf.n_estimators + FOREST_STEP, target)
+
+    if model_name == "sgd":
+        scaler = StandardScaler().fit(X)
+        Xs, Xs_val = scaler.transform(X), scaler.transform(X_val)
+        sgd = SGDClassifier(loss="log_loss", random_state=seed, **params)
+        classes = np.unique(y)
+        history = []
+        for epoch in range(1, MAX_EPOCHS + 1):
+            sgd.partial_fit(Xs, y, classes=classes)
+            history.append((sgd.predict(Xs_val) == y_val).mean())
+            if not improving(history):
+                break
+        return make_pipeline(scaler, sgd), epoch, epoch < MAX_EPOCHS
+
+    if model_name == "nb":
+        return GaussianNB(**params).fit(X, y), 1, False
+    if model_name == "svc":
+        return make_pipeline(StandardScaler(), SVC(probability=True, random_state=seed, **params)).fit(X, y), 1, False
+    raise ValueError(f"unknown model {model_name!r}")
+
+def run_job(job, store_path, train, val, test, tol, patience, seed, importance_rows=0):
+    X, codes, schema = _store(store_path)
+    columns = feature_set_columns(schema["columns"], job["features"])
+    index = [schema["columns"].index(c) for c in columns]
+    limit = MAX_TRAIN_ROWS.get(job["model"])
+    if limit and len(train) > limit:
+        train = np.sort(np.random.default_rng(seed).choice(train, limit, replace=False))
+
+    X_train, y_train = _rows(X, train, index), np.asarray(codes[train])
+    X_val, y_val = _rows(X, val, index), np.asarray(codes[val])
+    X_test, y_test = _rows(X, test, index), np.asarray(codes[test])
+
+    start = time.perf_counter()
+    model, steps, stopped_early = _fit_with_early_stopping(
+        job["model"], job["params"], X_train, y_train, X_val, y_val, tol, patience, seed)
+    train_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    proba = model.predict_proba(X_test)
+    batch_seconds = time.perf_counter() - start
+    single = []
+    for i in range(min(50, len(X_test))):
+        start = time.perf_counter()
+        model.predict_proba(X_test[i:i + 1])
+        single.append(time.perf_counter() - start)
+
+    result = dict(job, **{
+        "columns": len(columns),
+        "train_rows": len(train),
+        "steps": steps,
+        "stopped_early": stopped_early,
+        "train_seconds": round(train_seconds, 3),
+        "val_accuracy": round(float((model.predict(X_val) == y_val).mean()), 4),
+        "test_accuracy": round(float((model.classes_[proba.argmax(axis=1)] == y_test).mean()), 4),
+        "model_bytes": len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)),
+        "batch_us_per_row": round(1e6 * batch_seconds / max(len(X_test), 1), 3),
+        "single_row_ms": round(1e3 * float(np.median(single)), 3) if single else None,
+    })
+    if importance_rows:
+        sample = np.random.default_rng(seed).permutation(len(X_test))[:importance_rows]
+        result["importance"] = group_importance(model, X_test[sample], y_test[sample], columns, seed=seed)
+    return result
+
+# -----------------------------------------
+# 📋 Driver
+# -----------------------------------------
+
+def read_results(path):
+    if not path or not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def sweep(store_path, jobs, results_path=None, workers=None, val_fraction=0.1, test_fraction=0.2,
+          tol=0.001, patience=2, seed=0):
+    """Run ``jobs`` in parallel; returns all results with this setup (earlier runs included)."""
+    setup = run_setup(store_path, val_fraction, test_fraction, tol, patience, seed)
+    results = [r for r in read_results(results_path) if r.get("setup") == setup]
+    done = {job_key(r) for r in results}
+    todo = [job for job in jobs if job_key(job) not in done]
+    train, val, test = split_rows(setup["rows"], val_fraction, test_fraction, seed)
+    out = open(results_path, "a") if results_path else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            futures = {pool.submit(run_job, job, store_path, train, val, test, tol, patience, seed): job
+                       for job in todo}
+            for i, future in enumerate(as_completed(futures), 1):
+                job = futures[future]
+                try:
+                    result = dict(future.result(), setup=setup)
+                except Exception as e:
+                    print(f"[{i}/{len(todo)}] {job_key(job)} failed: {e}")
+                    continue
+                results.append(result)
+                if out:
+                    out.write(json.dumps(result) + "\n")
+                    out.flush()
+                print(f"[{i}/{len(todo)}] {result['model']:6} {result['features']:12} {json.dumps(result['params'])} "
+                      f"acc={result['test_accuracy']:.4f} train={result['train_seconds']:.1f}s")
+    finally:
+        if out:
+            out.close()
+    return results
+
+def pick_fastest(results, min_accuracy):
+    """Lowest batch latency per row among results with test accuracy >= ``min_accuracy``."""
+    good = [r for r in results if r["test_accuracy"] >= min_accuracy]
+    return min(good, key=lambda r: r["batch_us_per_row"]) if good else None
+
+def print_table(results):
+    print(f"{'model':6} {'features':12} {'params':44} {'acc':>7} {'train s':>8} {'size KB':>9} "
+          f"{'us/row':>8} {'1-row ms':>9}")
+    for r in sorted(results, key=lambda r: -r["test_accuracy"]):
+        print(f"{r['model']:6} {r['features']:12} {json.dumps(r['params'])[:44]:44} {r['test_accuracy']:7.4f} "
+              f"{r['train_seconds']:8.2f} {r['model_bytes'] / 1024:9.0f} {r['batch_us_per_row']:8.2f} "
+              f"{r['single_row_ms'] or 0:9.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep models, hyperparameters and feature subsets in parallel")
+    parser.add_argument("store", help="feature store directory (feature_extraction.py --format store)")
+    parser.add_argument("--models", nargs="+", choices=list(MODELS), default=["forest", "nb", "sgd"])
+    parser.add_argument("--feature-sets", nargs="+", choices=list(FEATURE_SETS), default=["all", "notebook"])
+    parser.add_argument("--grid", metavar="JSON", help="file with {model: {param: [values]}} replacing the defaults")
+    parser.add_argument("--results", default="sweep_results.jsonl",
+                        help="JSON-lines results; jobs finished with the same store, split and seed are skipped")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--val-fraction", type=float, default=0.1)
+    parser.add_argument("--test-fraction", type=float, default=0.2)
+    parser.add_argument("--tol", type=float, default=0.001, help="validation gain that counts as improving")
+    parser.add_argument("--patience", type=int, default=2, help="checks without improvement before stopping")
+    parser.add_argument("--min-accuracy", type=float, help="pick the fastest model at least this accurate "
+                        "(default: within 0.01 of the best)")
+    parser.add_argument("--importance-rows", type=int, default=0, metavar="N",
+                        help="refit the picked model and report feature-group permutation importance on N test rows")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    grid = dict(MODELS)
+    if args.grid:
+        with open(args.grid) as f:
+            grid.update(json.load(f))
+    feature_sets, skipped = distinct_feature_sets(read_schema(args.store)["columns"], args.feature_sets)
+    for name, same in skipped.items():
+        print(f"Skipping feature set {name!r}: on this store it keeps the same columns as {same!r}")
+    jobs = list(expand_jobs(args.models, feature_sets, grid))
+    print(f"{len(jobs)} jobs")
+    results = sweep(args.store, jobs, args.results, args.workers, args.val_fraction, args.test_fraction,
+                    args.tol, args.patience, args.seed)
+    results = [r for r in results if job_key(r) in {job_key(j) for j in jobs}]
+    if not results:
+        return
+    print()
+    print_table(results)
+    min_accuracy = args.min_accuracy
+    if min_accuracy is None:
+        min_accuracy = max(r["test_accuracy"] for r in results) - 0.01
+    best = pick_fastest(results, min_accuracy)
+    if best:
+        print(f"\nFastest with accuracy >= {min_accuracy:.4f}: {best['model']} {json.dumps(best['params'])} "
+              f"on '{best['features']}' ({best['test_accuracy']:.4f}, {best['batch_us_per_row']:.2f} us/row)")
+    else:
+        print(f"\nNo model reached accuracy {min_accuracy:.4f}")
+        return
+    if args.importance_rows:
+        schema = read_schema(args.store)
+        train, val, test = split_rows(schema["rows"], args.val_fraction, args.test_fraction, args.seed)
+        job = {k: best[k] for k in ("model", "params", "features")}
+        result = run_job(job, args.store, train, val, test, args.tol, args.patience, args.seed, args.importance_rows)
+        print(f"\nPermutation importance by feature group ({args.importance_rows} test rows, accuracy drop):")
+        for group, drop in result["importance"].items():
+            print(f"  {group:14} {drop:+.4f}")
+
+if __name__ == "__main__":
+    main()
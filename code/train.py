@@ -0,0 +1,286 @@
+import argparse
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+import pandas as pd
+
+from balance import balance_store
+from feature_schema import (
+    BYTE_FEATURE_GROUPS, FEATURE_COLUMNS, FEATURE_GROUPS, FEATURE_SCHEMA_VERSION, check_tables_hash, feature_mode,
+)
+from feature_store import SCHEMA_FILE, check_store_schema, load_feature_store, read_schema
+from model_artifact import save_artifact
+from shard_pipeline import load_manifest
+
+# -----------------------------------------
+# 🏋️ Out-of-core training on sharded features
+# -----------------------------------------
+# Features are read one shard at a time, from a feature store (row blocks of
+# the memory-mapped matrix) or a shard directory (the part-*.csv files of
+# feature_extraction.py --shards). Memory is bounded by the shard size,
+# not the corpus size.
+#   sgd, nb  incremental learners, partial_fit shard by shard (the next
+#            shard is loaded in the background while the current one fits)
+#   forest   one RandomForest per shard, fitted in parallel processes and
+#            merged into a single ensemble
+# With --balance, the training rows of a feature store are first SMOTE-
+# balanced into a new store (balance.py); held-out shards stay original.
+# The model and its LabelEncoder are written together as one versioned
+# artifact (model_artifact.py) that Predictor.load accepts.
+
+LEARNERS = ("sgd", "nb", "forest")
+DEFAULT_SHARD_ROWS = 50_000
+DEFAULT_DROP_GROUPS = ("freq_lower", "LDI", "RDI")  # the columns the notebook drops
+
+Shard = namedtuple("Shard", "kind path start stop")  # a CSV shard's path is a tuple of part files
+
+# -----------------------------------------
+# 📂 Shards
+# -----------------------------------------
+
+def list_shards(source, shard_rows=DEFAULT_SHARD_ROWS):
+    """Shards of a feature store or a finished shard directory, in row order.
+
+    A store's last row block is folded into the one before it when it is
+    shorter than half a shard, and a shard directory's last part file when
+    it holds fewer than half the rows of the one before, so no shard is a
+    handful of rows.
+    """
+    if os.path.exists(os.path.join(source, SCHEMA_FILE)):
+        schema = read_schema(source)
+        check_store_schema(schema, source)
+        rows = schema["rows"]
+        starts = list(range(0, rows, shard_rows))
+        if len(starts) > 1 and rows - starts[-1] < shard_rows // 2:
+            starts.pop()
+        return [Shard("store", source, start, stop) for start, stop in zip(starts, starts[1:] + [rows])]
+    manifest = load_manifest(source)
+    if manifest and manifest.get("complete"):
+        if manifest.get("schema_version") != FEATURE_SCHEMA_VERSION:
+            raise ValueError(f"{source} holds features of schema version {manifest.get('schema_version')}, "
+                             f"not {FEATURE_SCHEMA_VERSION}; re-extract them")
+        check_tables_hash(manifest.get("digraph_tables"), FEATURE_COLUMNS, source)
+        parts = [((os.path.join(source, name),), rows) for name, rows in sorted(manifest["done"].items())]
+        if len(parts) > 1 and parts[-1][1] < parts[-2][1] // 2:
+            (last, rows), (previous, previous_rows) = parts.pop(), parts.pop()
+            parts.append((previous + last, previous_rows + rows))
+        return [Shard("csv", paths, 0, rows) for paths, rows in parts]
+    raise ValueError(f"{source} is neither a feature store nor a complete shard directory")
+
+def source_columns(source):
+    """Feature columns held by a feature store (its schema) or a shard directory (all text features)."""
+    if os.path.exists(os.path.join(source, SCHEMA_FILE)):
+        return list(read_schema(source)["columns"])
+    return list(FEATURE_COLUMNS)
+
+def load_shard(shard, columns):
+    """(X, labels) of one shard: a float32 DataFrame of ``columns`` and an array of label strings."""
+    if shard.kind == "store":
+        X, codes, schema = load_feature_store(shard.path)
+        index = [schema["columns"].index(c) for c in columns]
+        block = np.asarray(X[shard.start:shard.stop])[:, index]
+        labels = np.asarray(schema["classes"], dtype=object)[codes[shard.start:shard.stop]]
+        return pd.DataFrame(block, columns=columns), labels
+    df = pd.concat([pd.read_csv(path) for path in shard.path], ignore_index=True)
+    return df[columns].astype(np.float32), df["label"].to_numpy(dtype=object)
+
+def source_classes(source, shards):
+    """Every label in the data, needed up front by partial_fit."""
+    if shards and shards[0].kind == "store":
+        return sorted(read_schema(source)["classes"])
+    labels = set()
+    for shard in shards:
+        for path in shard.path:
+            labels.update(pd.read_csv(path, usecols=["label"])["label"].astype(str))
+    return sorted(labels)
+
+def iter_prefetched(shards, columns):
+    """Yield loaded shards, reading the next one while the caller works on the current."""
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(load_shard, shards[0], columns) if shards else None
+        for i in range(len(shards)):
+            X, labels = pending.result()
+            if i + 1 < len(shards):
+                pending = pool.submit(load_shard, shards[i + 1], columns)
+            yield X, labels
+
+# -----------------------------------------
+# 📈 Incremental learners
+# -----------------------------------------
+
+def train_incremental(learner, shards, columns, label_encoder, epochs=1, seed=0):
+    classes = np.arange(len(label_encoder.classes_))
+    if learner == "nb":
+        from sklearn.naive_bayes import GaussianNB
+
+        model = GaussianNB()
+        for X, labels in iter_prefetched(shards, columns):
+            model.partial_fit(X, label_encoder.transform(labels), classes=classes)
+        return model
+
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    # One pass for the scaling statistics, then SGD epochs over shuffled shard order
+    scaler = StandardScaler()
+    for X, _ in iter_prefetched(shards, columns):
+        scaler.partial_fit(X)
+    sgd = SGDClassifier(loss="log_loss", random_state=seed)
+    rng = random.Random(seed)
+    order = list(shards)
+    for _ in range(epochs):
+        rng.shuffle(order)
+        for X, labels in iter_prefetched(order, columns):
+            sgd.partial_fit(scaler.transform(X), label_encoder.transform(labels), classes=classes)
+    return Pipeline([("scale", scaler), ("sgd", sgd)])
+
+# -----------------------------------------
+# 🌲 Per-shard forests, merged
+# -----------------------------------------
+
+def _fit_shard_forest(shard, columns, classes, n_estimators, seed):
+    from sklearn.ensemble import RandomForestClassifier
+
+    X, labels = load_shard(shard, columns)
+    y = np.searchsorted(classes, labels)
+    missing = sorted(set(range(len(classes))) - set(np.unique(y)))
+    if missing:
+        # Every tree must know every class, or the merged forest cannot average them
+        where = shard.path if shard.kind == "store" else " + ".join(shard.path)
+        raise ValueError(f"shard {where}[{shard.start}:{shard.stop}] has no rows labelled "
+                         f"{', '.join(classes[i] for i in missing)}; use larger shards")
+    return RandomForestClassifier(n_estimators=n_estimators, random_state=seed, n_jobs=1).fit(X, y)
+
+def merge_forests(forests):
+    """One forest whose trees are the trees of all ``forests`` (same classes)."""
+    merged = forests[0]
+    merged.estimators_ = [tree for forest in forests for tree in forest.estimators_]
+    merged.n_estimators = len(merged.estimators_)
+    return merged
+
+def train_forest(shards, columns, label_encoder, trees_per_shard=10, workers=None, seed=0):
+    workers = workers or os.cpu_count() or 1
+    classes = np.asarray(label_encoder.classes_, dtype=object)
+    forests = [None] * len(shards)
+    pending = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for i, shard in enumerate(shards):
+            # Only a couple of shards per worker in flight
+            while len(pending) >= 2 * workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    forests[pending.pop(future)] = future.result()
+            future = pool.submit(_fit_shard_forest, shard, columns, classes, trees_per_shard, seed + i)
+            pending[future] = i
+        for future in wait(pending).done:
+            forests[pending.pop(future)] = future.result()
+    return merge_forests(forests)
+
+# -----------------------------------------
+# 🚀 Entry point
+# -----------------------------------------
+
+def train(source, learner="forest", columns=None, shard_rows=DEFAULT_SHARD_ROWS, holdout=0,
+          epochs=1, trees_per_shard=10, workers=None, seed=0, balance=None):
+    """Train on ``source``; returns (model, label_encoder, metadata).
+
+    The last ``holdout`` shards are kept out of training and used to report
+    accuracy in the metadata. ``balance`` is a directory the SMOTE-balanced
+    training rows are written to (feature store sources only).
+    """
+    from sklearn.preprocessing import LabelEncoder
+
+    available = source_columns(source)
+    columns = available if columns is None else list(columns)
+    missing = [c for c in columns if c not in available]
+    if missing:
+        raise ValueError(f"{source} does not hold the feature columns {', '.join(missing)}")
+    shards = list_shards(source, shard_rows)
+    if holdout >= len(shards):
+        raise ValueError(f"cannot hold out {holdout} of {len(shards)} shards")
+    train_shards, eval_shards = shards[:len(shards) - holdout], shards[len(shards) - holdout:]
+    label_encoder = LabelEncoder().fit(source_classes(source, shards))
+
+    synthetic = None
+    if balance:
+        if shards[0].kind != "store":
+            raise ValueError("balancing needs a feature store source, not a shard directory")
+        synthetic = sum(balance_store(source, balance, stop=train_shards[-1].stop, workers=workers,
+                                      seed=seed).values())
+        train_shards = list_shards(balance, shard_rows)
+
+    start = time.perf_counter()
+    if learner == "forest":
+        model = train_forest(train_shards, columns, label_encoder, trees_per_shard, workers, seed)
+    else:
+        model = train_incremental(learner, train_shards, columns, label_encoder, epochs, seed)
+    metadata = {
+        "learner": learner,
+        "source": os.path.abspath(source),
+        "train_rows": sum(s.stop - s.start for s in train_shards),
+        "shards": len(train_shards),
+        "train_seconds": round(time.perf_counter() - start, 3),
+    }
+    if synthetic is not None:
+        metadata["balanced"] = os.path.abspath(balance)
+        metadata["synthetic_rows"] = synthetic
+
+    if eval_shards:
+        correct = total = 0
+        for X, labels in iter_prefetched(eval_shards, columns):
+            correct += int((model.predict(X) == label_encoder.transform(labels)).sum())
+            total += len(labels)
+        metadata["holdout_rows"] = total
+        metadata["holdout_accuracy"] = correct / total if total else None
+    return model, label_encoder, metadata
+
+def main():
+    parser = argparse.ArgumentParser(description="Train a model on sharded features without loading them all")
+    parser.add_argument("source", help="feature store directory or complete shard directory")
+    parser.add_argument("-o", "--output", default="encryption_model.joblib", help="model artifact to write")
+    parser.add_argument("--learner", choices=LEARNERS, default="forest")
+    parser.add_argument("--shard-rows", type=int, default=DEFAULT_SHARD_ROWS, help="rows per shard (feature stores)")
+    parser.add_argument("--drop-groups", nargs="*", metavar="GROUP",
+                        help="feature groups of the source's mode (text or bytes, from its columns) left out "
+                        f"(default: {' '.join(DEFAULT_DROP_GROUPS)} for text, none for bytes)")
+    parser.add_argument("--balance", metavar="DIR", help="SMOTE-balance the training rows into this feature store "
+                        "first (feature store sources; see balance.py)")
+    parser.add_argument("--holdout", type=int, default=0, help="hold out the last N shards to report accuracy")
+    parser.add_argument("--epochs", type=int, default=5, help="passes over the data (sgd)")
+    parser.add_argument("--trees-per-shard", type=int, default=10, help="trees per shard forest (forest)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (forest; default: all cores)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    available = source_columns(args.source)
+    mode = feature_mode(available)
+    groups = BYTE_FEATURE_GROUPS if mode == "bytes" else FEATURE_GROUPS
+    drop_groups = args.drop_groups
+    if drop_groups is None:
+        drop_groups = DEFAULT_DROP_GROUPS if mode == "text" else ()
+    unknown = [group for group in drop_groups if group not in groups]
+    if unknown:
+        parser.error(f"--drop-groups: {', '.join(unknown)} not among the {mode} feature groups "
+                     f"({', '.join(groups)})")
+    dropped = {c for group in drop_groups for c in groups[group]}
+    columns = [c for c in available if c not in dropped]
+    model, label_encoder, metadata = train(
+        args.source, args.learner, columns, args.shard_rows, args.holdout,
+        args.epochs, args.trees_per_shard, args.workers, args.seed, args.balance,
+    )
+    save_artifact(args.output, model, label_encoder, metadata)
+    print(f"Trained {args.learner} on {metadata['train_rows']} rows in {metadata['shards']} shards "
+          f"({metadata['train_seconds']}s)")
+    if "synthetic_rows" in metadata:
+        print(f"Balanced with {metadata['synthetic_rows']} SMOTE rows in {metadata['balanced']}")
+    if "holdout_accuracy" in metadata:
+        print(f"Holdout accuracy: {metadata['holdout_accuracy']:.4f} on {metadata['holdout_rows']} rows")
+    print(f"Model artifact saved to {args.output}")
+
+if __name__ == "__main__":
+    main()